@@ -1,18 +1,37 @@
 # hysteria.py
 
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 from collections import Counter
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+import bisect
+import heapq
+import operator
+import os
 import sys
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the array engine needs it
+    np = None
+
+DEFAULT_MAX_PAIRS_IN_MEMORY = 1_000_000
+DEFAULT_MERGE_FAN_IN = 64
+
+def parse_line(line: str) -> Tuple[int, int]:
+    parts = line.strip().split()
+    if len(parts) != 2:
+        raise ValueError(f"Invalid line format: '{line}'. Each line must contain exactly two numbers.")
+    left, right = map(int, parts)
+    return left, right
 
 def parse_input(input_data: str) -> Tuple[List[int], List[int]]:
     left_list = []
     right_list = []
     lines = input_data.strip().splitlines()
     for line in lines:
-        parts = line.strip().split()
-        if len(parts) != 2:
-            raise ValueError(f"Invalid line format: '{line}'. Each line must contain exactly two numbers.")
-        left, right = map(int, parts)
+        left, right = parse_line(line)
         left_list.append(left)
         right_list.append(right)
     return left_list, right_list
@@ -30,25 +49,310 @@ def compute_similarity_score(left: List[int], right: List[int]) -> int:
     similarity_score = sum(number * right_counter.get(number, 0) for number in left)
     return similarity_score
 
+class LocationIndex:
+    """
+    Maintains the total distance and similarity score while pairs are added and removed.
+
+    Both sides are kept as sorted lists used as order-statistic structures (bisect for
+    rank, indexing for select). Building the index sorts each side once, in
+    O(n log n). Adding or removing a pair only shifts the pairing of the ranks between
+    the left and right insertion points, so only that span is re-summed: an update costs
+    O(log n) to find both ranks, an O(n) memmove for the list insert or delete, and
+    O(|rank(l) - rank(r)|) to re-sum the span, which is O(n) in the worst case. The
+    similarity score is sum(v * left_count[v] * right_count[v]) and changes by a single
+    term per inserted or removed value, so it updates in O(1).
+    """
+
+    def __init__(self, left: Iterable[int] = (), right: Iterable[int] = ()):
+        self._left: List[int] = sorted(left)
+        self._right: List[int] = sorted(right)
+        if len(self._left) != len(self._right):
+            raise ValueError("Both lists must have the same number of elements.")
+        self._left_counts: Counter = Counter(self._left)
+        self._right_counts: Counter = Counter(self._right)
+        self._total_distance = self._span_distance(0, len(self._left))
+        self._similarity_score = sum(
+            value * count * self._right_counts.get(value, 0) for value, count in self._left_counts.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._left)
+
+    def _span_distance(self, lo: int, hi: int) -> int:
+        return sum(map(abs, map(operator.sub, self._left[lo:hi], self._right[lo:hi])))
+
+    def add_pair(self, left: int, right: int) -> None:
+        k = bisect.bisect_right(self._left, left)
+        j = bisect.bisect_right(self._right, right)
+        lo, hi = min(k, j), max(k, j)
+        self._total_distance -= self._span_distance(lo, hi)
+        self._left.insert(k, left)
+        self._right.insert(j, right)
+        self._total_distance += self._span_distance(lo, hi + 1)
+
+        self._similarity_score += left * self._right_counts[left]
+        self._left_counts[left] += 1
+        self._similarity_score += right * self._left_counts[right]
+        self._right_counts[right] += 1
+
+    def remove_pair(self, left: int, right: int) -> None:
+        if self._left_counts[left] == 0 or self._right_counts[right] == 0:
+            raise ValueError(f"Pair ({left}, {right}) is not in the index.")
+        k = bisect.bisect_left(self._left, left)
+        j = bisect.bisect_left(self._right, right)
+        lo, hi = min(k, j), max(k, j)
+        self._total_distance -= self._span_distance(lo, hi + 1)
+        del self._left[k]
+        del self._right[j]
+        self._total_distance += self._span_distance(lo, hi)
+
+        self._right_counts[right] -= 1
+        self._similarity_score -= right * self._left_counts[right]
+        self._left_counts[left] -= 1
+        self._similarity_score -= left * self._right_counts[left]
+
+    def total_distance(self) -> int:
+        return self._total_distance
+
+    def similarity_score(self) -> int:
+        return self._similarity_score
+
+def _write_run(values: List[int], directory: str) -> str:
+    values.sort()
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'w') as f:
+        f.writelines(f"{value}\n" for value in values)
+    return path
+
+def _read_run(f) -> Iterator[int]:
+    for line in f:
+        yield int(line)
+
+def _merge_run_group(paths: List[str], directory: str) -> str:
+    fd, merged_path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with ExitStack() as stack:
+        run_files = [stack.enter_context(open(path, 'r')) for path in paths]
+        with os.fdopen(fd, 'w') as out:
+            out.writelines(f"{value}\n" for value in heapq.merge(*(_read_run(f) for f in run_files)))
+    for path in paths:
+        os.remove(path)
+    return merged_path
+
+def _reduce_runs(paths: List[str], fan_in: int, directory: str) -> List[str]:
+    # Merges groups of at most fan_in runs into new runs until at most fan_in remain
+    while len(paths) > fan_in:
+        paths = [_merge_run_group(paths[i:i + fan_in], directory) for i in range(0, len(paths), fan_in)]
+    return paths
+
+def compute_total_distance_external(input_file: str, max_pairs_in_memory: int = DEFAULT_MAX_PAIRS_IN_MEMORY,
+                                    fan_in: int = DEFAULT_MERGE_FAN_IN) -> int:
+    """
+    Computes the total distance without holding both lists in memory.
+
+    The input is read in chunks of at most max_pairs_in_memory pairs; each chunk is
+    sorted and spilled to temporary run files. Runs are merged at most fan_in at a time
+    in as many passes as needed, and the remaining left and right runs are then merged
+    in lockstep to add up abs(l - r). At most 2 * fan_in run files are open at once, so
+    peak memory and file handles are bounded by the two parameters, not the input size.
+    """
+    if max_pairs_in_memory < 1:
+        raise ValueError("max_pairs_in_memory must be at least 1.")
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+
+    with tempfile.TemporaryDirectory(prefix='hysteria-') as run_dir:
+        left_runs = []
+        right_runs = []
+        left_chunk = []
+        right_chunk = []
+        with open(input_file, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                left, right = parse_line(line)
+                left_chunk.append(left)
+                right_chunk.append(right)
+                if len(left_chunk) >= max_pairs_in_memory:
+                    left_runs.append(_write_run(left_chunk, run_dir))
+                    right_runs.append(_write_run(right_chunk, run_dir))
+                    left_chunk = []
+                    right_chunk = []
+        if left_chunk:
+            left_runs.append(_write_run(left_chunk, run_dir))
+            right_runs.append(_write_run(right_chunk, run_dir))
+        del left_chunk, right_chunk
+
+        left_runs = _reduce_runs(left_runs, fan_in, run_dir)
+        right_runs = _reduce_runs(right_runs, fan_in, run_dir)
+        with ExitStack() as stack:
+            left_files = [stack.enter_context(open(path, 'r')) for path in left_runs]
+            right_files = [stack.enter_context(open(path, 'r')) for path in right_runs]
+            merged_left = heapq.merge(*(_read_run(f) for f in left_files))
+            merged_right = heapq.merge(*(_read_run(f) for f in right_files))
+            total_distance = sum(abs(l - r) for l, r in zip(merged_left, merged_right))
+    return total_distance
+
+def shard_byte_ranges(input_file: str, shard_count: int) -> List[Tuple[int, int]]:
+    """
+    Splits the file into at most shard_count byte ranges that start and end on line boundaries.
+    """
+    size = os.path.getsize(input_file)
+    boundaries = [0]
+    with open(input_file, 'rb') as f:
+        for i in range(1, shard_count):
+            target = size * i // shard_count
+            if target <= boundaries[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # Advance to the start of the next line
+            boundaries.append(f.tell())
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+def _iter_shard_pairs(input_file: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    with open(input_file, 'rb') as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            if line.strip():
+                yield parse_line(line.decode())
+
+def _count_right_shard(input_file: str, start: int, end: int) -> Counter:
+    return Counter(right for _, right in _iter_shard_pairs(input_file, start, end))
+
+_shard_right_counter: Counter = Counter()
+
+def _init_score_worker(right_counter: Counter) -> None:
+    global _shard_right_counter
+    _shard_right_counter = right_counter
+
+def _score_left_shard(input_file: str, start: int, end: int) -> int:
+    right_counter = _shard_right_counter
+    return sum(left * right_counter.get(left, 0) for left, _ in _iter_shard_pairs(input_file, start, end))
+
+def compute_similarity_score_parallel(input_file: str, workers: Optional[int] = None) -> int:
+    """
+    Computes the similarity score with a process pool over line-aligned byte-range shards.
+
+    Workers first build partial counts of the right column, which are merged and shipped
+    once to each worker of a second pool that scores its shard of the left column.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = shard_byte_ranges(input_file, workers)
+    if not shards:
+        return 0
+    starts, ends = zip(*shards)
+    paths = [input_file] * len(shards)
+
+    right_counter: Counter = Counter()
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        for partial in executor.map(_count_right_shard, paths, starts, ends):
+            right_counter.update(partial)
+
+    with ProcessPoolExecutor(max_workers=len(shards), initializer=_init_score_worker,
+                             initargs=(right_counter,)) as executor:
+        return sum(executor.map(_score_left_shard, paths, starts, ends))
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The array engine requires numpy. Install it with 'pip install numpy'.")
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+def parse_input_array(input_data: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    _require_numpy()
+    stripped = input_data.strip()
+    if not stripped:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    # Count the tokens on every line from the raw bytes: a token starts at each
+    # non-whitespace byte that follows whitespace (or the start of the input).
+    encoded = stripped.encode()
+    raw = np.frombuffer(encoded, dtype=np.uint8)
+    is_space = np.isin(raw, np.frombuffer(b' \t\r\n\v\f', dtype=np.uint8))
+    token_starts = np.flatnonzero(~is_space & np.concatenate(([True], is_space[:-1])))
+    token_ends = np.flatnonzero(~is_space & np.concatenate((is_space[1:], [True]))) + 1
+    line_of_byte = np.cumsum(raw == ord('\n'))
+    line_count = int(line_of_byte[-1]) + 1
+    tokens_per_line = np.bincount(line_of_byte[token_starts], minlength=line_count)
+    if np.any(tokens_per_line != 2):
+        bad_line = stripped.splitlines()[int(np.argmax(tokens_per_line != 2))]
+        raise ValueError(f"Invalid line format: '{bad_line}'. Each line must contain exactly two numbers.")
+    # fromstring silently clamps values outside int64. Tokens of up to 18 characters
+    # always fit, so only the rare longer ones are checked exactly.
+    long_tokens = token_ends - token_starts > 18
+    for start, end in zip(token_starts[long_tokens], token_ends[long_tokens]):
+        token = encoded[start:end].decode()
+        if not _INT64_MIN <= int(token) <= _INT64_MAX:
+            raise ValueError(f"Value '{token}' does not fit in a 64-bit integer.")
+    values = np.fromstring(stripped, dtype=np.int64, sep=' ')
+    if values.size != 2 * line_count:
+        raise ValueError("Invalid line format. Each line must contain exactly two integers.")
+    pairs = values.reshape(line_count, 2)
+    return np.ascontiguousarray(pairs[:, 0]), np.ascontiguousarray(pairs[:, 1])
+
+def compute_total_distance_array(left: "np.ndarray", right: "np.ndarray") -> int:
+    _require_numpy()
+    if len(left) != len(right):
+        raise ValueError("Both lists must have the same number of elements.")
+    sorted_left = np.sort(left, kind='stable')
+    sorted_right = np.sort(right, kind='stable')
+    return int(np.abs(sorted_left - sorted_right).sum())
+
+def compute_similarity_score_array(left: "np.ndarray", right: "np.ndarray") -> int:
+    _require_numpy()
+    if len(left) == 0 or len(right) == 0:
+        return 0
+    values, counts = np.unique(right, return_counts=True)
+    idx = np.searchsorted(values, left)
+    idx[idx == len(values)] = 0
+    matched = values[idx] == left
+    return int((left[matched] * counts[idx[matched]]).sum())
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python hysteria.py <input_file> <part>")
+    if len(sys.argv) not in (3, 4) or (len(sys.argv) == 4 and sys.argv[3] not in ('--numpy', '--external', '--parallel')):
+        print("Usage: python hysteria.py <input_file> <part> [--numpy|--external|--parallel]")
         print("       <part> should be either '1' for Part One or '2' for Part Two")
+        print("       --numpy uses the vectorized array engine")
+        print("       --external computes Part One with an out-of-core merge sort")
+        print("       --parallel computes Part Two with a sharded process pool")
         sys.exit(1)
 
     input_file = sys.argv[1]
     part = sys.argv[2]
+    engine = sys.argv[3] if len(sys.argv) == 4 else None
 
     try:
+        if engine == '--external':
+            if part != '1':
+                raise ValueError("--external is only supported for Part One.")
+            total_distance = compute_total_distance_external(input_file)
+            print(f"Total Distance (Part One): {total_distance}")
+            return
+        if engine == '--parallel':
+            if part != '2':
+                raise ValueError("--parallel is only supported for Part Two.")
+            similarity_score = compute_similarity_score_parallel(input_file)
+            print(f"Similarity Score (Part Two): {similarity_score}")
+            return
+
         with open(input_file, 'r') as f:
             input_data = f.read()
-        left, right = parse_input(input_data)
+        if engine == '--numpy':
+            left, right = parse_input_array(input_data)
+            distance_fn, similarity_fn = compute_total_distance_array, compute_similarity_score_array
+        else:
+            left, right = parse_input(input_data)
+            distance_fn, similarity_fn = compute_total_distance, compute_similarity_score
 
         if part == '1':
-            total_distance = compute_total_distance(left, right)
+            total_distance = distance_fn(left, right)
             print(f"Total Distance (Part One): {total_distance}")
         elif part == '2':
-            similarity_score = compute_similarity_score(left, right)
+            similarity_score = similarity_fn(left, right)
             print(f"Similarity Score (Part Two): {similarity_score}")
         else:
             raise ValueError("Invalid part specified. Choose '1' for Part One or '2' for Part Two.")
@@ -4,9 +4,23 @@ import pytest
 from day1_historian_hysteria.hysteria import (
     parse_input,
     compute_total_distance,
-    compute_similarity_score
+    compute_similarity_score,
+    parse_input_array,
+    compute_total_distance_array,
+    compute_similarity_score_array,
+    compute_total_distance_external,
+    LocationIndex,
+    shard_byte_ranges,
+    compute_similarity_score_parallel
 )
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
 def test_parse_input():
     input_data = """
     1 2
@@ -102,4 +116,228 @@ def test_compute_similarity_score_right_empty():
     right = []
     expected_score = 0
     score = compute_similarity_score(left, right)
-    assert score == expected_score, "Similarity score should be 0 when right list is empty."
\ No newline at end of file
+    assert score == expected_score, "Similarity score should be 0 when right list is empty."
+
+# Tests for the numpy array engine
+@requires_numpy
+def test_parse_input_array():
+    input_data = """
+    1 2
+    3 4
+    5 6
+    """
+    left, right = parse_input_array(input_data)
+    assert left.dtype == np.int64 and right.dtype == np.int64, "Array engine should parse into int64 arrays."
+    assert left.tolist() == [1, 3, 5], "Left array does not match expected output."
+    assert right.tolist() == [2, 4, 6], "Right array does not match expected output."
+
+@requires_numpy
+def test_parse_input_array_invalid_line():
+    input_data = """
+    1 2
+    3
+    4 5
+    """
+    with pytest.raises(ValueError) as exc_info:
+        parse_input_array(input_data)
+    assert "Invalid line format" in str(exc_info.value), "Did not raise ValueError for invalid line."
+
+@requires_numpy
+@pytest.mark.parametrize("input_data", [
+    "99999999999999999999 1\n2 3",
+    "1 2\n3 -9223372036854775809",
+    "1 9223372036854775808",
+])
+def test_parse_input_array_rejects_int64_overflow(input_data):
+    with pytest.raises(ValueError):
+        parse_input_array(input_data)
+
+@requires_numpy
+def test_parse_input_array_int64_limits():
+    input_data = "9223372036854775807 -9223372036854775808\n0000000000000000000012 -0000000000000000000034"
+    left, right = parse_input_array(input_data)
+    assert (left.tolist(), right.tolist()) == parse_input(input_data), \
+        "Values at the int64 limits and long zero-padded tokens should parse exactly."
+
+@requires_numpy
+@pytest.mark.parametrize("input_data", ["1 2 3\n4", "1 2\n\n3 4", "1\n2 3 4"])
+def test_parse_input_array_rejects_mispaired_lines(input_data):
+    # The total token count is even, but individual lines do not hold two numbers
+    with pytest.raises(ValueError) as exc_info:
+        parse_input_array(input_data)
+    assert "Invalid line format" in str(exc_info.value), "Did not raise ValueError for mispaired lines."
+    with pytest.raises(ValueError):
+        parse_input(input_data)
+
+@requires_numpy
+@pytest.mark.parametrize("left,right", [
+    ([3, 4, 2, 1, 3, 3], [4, 3, 5, 3, 9, 3]),
+    ([1, 2, 3], [2, 3, 2, 4]),
+    ([2, 3, 2], [2, 2, 3]),
+    ([1, 2], [3, 4]),
+    ([], []),
+    ([], [1, 2, 3]),
+    ([1, 2, 3], []),
+    ([100, 5, 7], [1, 100, 100]),
+])
+def test_array_engine_matches_reference(left, right):
+    left_array = np.array(left, dtype=np.int64)
+    right_array = np.array(right, dtype=np.int64)
+    if len(left) == len(right):
+        assert compute_total_distance_array(left_array, right_array) == compute_total_distance(left, right), \
+            "Array engine total distance differs from reference."
+    assert compute_similarity_score_array(left_array, right_array) == compute_similarity_score(left, right), \
+        "Array engine similarity score differs from reference."
+
+@requires_numpy
+def test_compute_total_distance_array_length_mismatch():
+    with pytest.raises(ValueError):
+        compute_total_distance_array(np.array([1, 2], dtype=np.int64), np.array([1], dtype=np.int64))
+
+# Tests for the out-of-core external merge sort mode
+@pytest.mark.parametrize("max_pairs_in_memory", [1, 2, 4, 1000])
+def test_compute_total_distance_external_matches_reference(tmp_path, max_pairs_in_memory):
+    input_data = "3   4\n4   3\n2   5\n1   3\n3   9\n3   3\n"
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(input_data)
+    left, right = parse_input(input_data)
+    expected_distance = compute_total_distance(left, right)
+    distance = compute_total_distance_external(str(input_file), max_pairs_in_memory)
+    assert distance == expected_distance, "External merge sort distance differs from reference."
+
+def test_compute_total_distance_external_multi_pass_merge(tmp_path, monkeypatch):
+    # 300 pairs with a budget of 4 give 75 runs per side, far more than the fan-in of 3
+    input_data = "".join(f"{i * 37 % 101}   {i * 53 % 97}\n" for i in range(300))
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(input_data)
+    left, right = parse_input(input_data)
+
+    open_files = []
+    peak_open = [0]
+    real_open = open
+
+    class TrackedFile:
+        def __init__(self, *args, **kwargs):
+            self._file = real_open(*args, **kwargs)
+            open_files.append(self)
+            peak_open[0] = max(peak_open[0], len(open_files))
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self._file.close()
+            open_files.remove(self)
+
+        def __iter__(self):
+            return iter(self._file)
+
+    monkeypatch.setattr("day1_historian_hysteria.hysteria.open", TrackedFile, raising=False)
+    distance = compute_total_distance_external(str(input_file), max_pairs_in_memory=4, fan_in=3)
+    assert distance == compute_total_distance(left, right), "Multi-pass merge distance differs from reference."
+    assert peak_open[0] <= 2 * 3, f"At most 2 * fan_in run files should be open, got {peak_open[0]}."
+
+def test_compute_total_distance_external_invalid_fan_in(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("1 2\n")
+    with pytest.raises(ValueError):
+        compute_total_distance_external(str(input_file), 10, fan_in=1)
+
+def test_compute_total_distance_external_empty_file(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("")
+    assert compute_total_distance_external(str(input_file)) == 0, "Total distance of an empty file should be 0."
+
+def test_compute_total_distance_external_invalid_line(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("1 2\n3\n4 5\n")
+    with pytest.raises(ValueError) as exc_info:
+        compute_total_distance_external(str(input_file), 1)
+    assert "Invalid line format" in str(exc_info.value), "Did not raise ValueError for invalid line."
+
+def test_compute_total_distance_external_invalid_budget(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("1 2\n")
+    with pytest.raises(ValueError):
+        compute_total_distance_external(str(input_file), 0)
+
+# Tests for the incremental LocationIndex
+def test_location_index_matches_example():
+    left = [3, 4, 2, 1, 3, 3]
+    right = [4, 3, 5, 3, 9, 3]
+    index = LocationIndex(left, right)
+    assert len(index) == 6, "Index should hold every added pair."
+    assert index.total_distance() == 11, "Incremental total distance is incorrect."
+    assert index.similarity_score() == 31, "Incremental similarity score is incorrect."
+
+def test_location_index_add_and_remove_track_reference():
+    pairs = [(5, 1), (1, 5), (3, 3), (7, 2), (2, 7), (3, 1), (1, 3), (4, 4)]
+    index = LocationIndex()
+    left, right = [], []
+    for l, r in pairs:
+        index.add_pair(l, r)
+        left.append(l)
+        right.append(r)
+        assert index.total_distance() == compute_total_distance(left, right), "Distance diverged after add_pair."
+        assert index.similarity_score() == compute_similarity_score(left, right), "Similarity diverged after add_pair."
+    for l, r in [(3, 1), (5, 7), (1, 3), (4, 5)]:
+        index.remove_pair(l, r)
+        left.remove(l)
+        right.remove(r)
+        assert index.total_distance() == compute_total_distance(left, right), "Distance diverged after remove_pair."
+        assert index.similarity_score() == compute_similarity_score(left, right), "Similarity diverged after remove_pair."
+
+def test_location_index_realistic_size():
+    # 200k pairs must build in O(n log n), not by inserting pairs one at a time
+    size = 200_000
+    left = [(i * 7919) % 100_003 for i in range(size)]
+    right = [(i * 104_729) % 99_991 for i in range(size)]
+    index = LocationIndex(left, right)
+    assert index.total_distance() == compute_total_distance(left, right), "Distance of a large index is incorrect."
+    assert index.similarity_score() == compute_similarity_score(left, right), "Similarity of a large index is incorrect."
+    for l, r in [(5, 99_000), (100_000, 3), (left[0], right[-1])]:
+        index.add_pair(l, r)
+        left.append(l)
+        right.append(r)
+    index.remove_pair(left[1], right[2])
+    left.remove(left[1])
+    right.remove(right[2])
+    assert index.total_distance() == compute_total_distance(left, right), "Distance diverged after large updates."
+    assert index.similarity_score() == compute_similarity_score(left, right), "Similarity diverged after large updates."
+
+def test_location_index_remove_missing_pair():
+    index = LocationIndex([1, 2], [3, 4])
+    with pytest.raises(ValueError):
+        index.remove_pair(1, 5)
+    assert index.total_distance() == 4, "Failed removal should leave the index unchanged."
+
+def test_location_index_length_mismatch():
+    with pytest.raises(ValueError):
+        LocationIndex([1, 2], [1])
+
+# Tests for the sharded parallel similarity score
+def test_shard_byte_ranges_align_to_lines(tmp_path):
+    input_data = "".join(f"{i} {i * 7 % 13}\n" for i in range(50))
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(input_data)
+    raw = input_file.read_bytes()
+    shards = shard_byte_ranges(str(input_file), 8)
+    assert shards[0][0] == 0 and shards[-1][1] == len(raw), "Shards should cover the whole file."
+    for (_, end), (start, _) in zip(shards, shards[1:]):
+        assert end == start, "Shards should be contiguous."
+        assert raw[start - 1:start] == b"\n", "Shards should start on a line boundary."
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_compute_similarity_score_parallel_matches_reference(tmp_path, workers):
+    input_data = "".join(f"{i % 11}   {i * 7 % 13}\n" for i in range(200))
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(input_data)
+    left, right = parse_input(input_data)
+    expected_score = compute_similarity_score(left, right)
+    score = compute_similarity_score_parallel(str(input_file), workers)
+    assert score == expected_score, "Parallel similarity score differs from reference."
+
+def test_compute_similarity_score_parallel_empty_file(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("")
+    assert compute_similarity_score_parallel(str(input_file), 4) == 0, "Similarity of an empty file should be 0."
@@ -1,23 +1,48 @@
 # reports.py
 
-from typing import List
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from array import array
+from dataclasses import dataclass, field
 import sys
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the CSR batch functions need it
+    np = None
+
+class ReportDiagnostic(NamedTuple):
+    line_number: int
+    severity: str  # "warning" or "error"
+    message: str
+
+@dataclass
+class ReportScanResult:
+    safe_count: int = 0
+    dampened_safe_count: int = 0
+    report_count: int = 0
+    skipped_lines: List[int] = field(default_factory=list)
+    diagnostics: List[ReportDiagnostic] = field(default_factory=list)
+
+def _parse_report_line(line: str, line_number: int) -> Tuple[Optional[List[int]], Optional[ReportDiagnostic]]:
+    if not line.strip():
+        return None, None
+    try:
+        levels = list(map(int, line.strip().split()))
+    except ValueError as ve:
+        return None, ReportDiagnostic(line_number, "error", f"Error parsing line {line_number}: '{line}'. {ve}")
+    if len(levels) < 2:
+        return None, ReportDiagnostic(line_number, "warning", f"Warning: Line {line_number} has less than two numbers. Skipping.")
+    return levels, None
+
 def parse_input(input_data: str) -> List[List[int]]:
     reports = []
     lines = input_data.strip().splitlines()
     for line_number, line in enumerate(lines, start=1):
-        if not line.strip():
-            continue
-        try:
-            levels = list(map(int, line.strip().split()))
-            if len(levels) < 2:
-                print(f"Warning: Line {line_number} has less than two numbers. Skipping.")
-                continue
+        levels, diagnostic = _parse_report_line(line, line_number)
+        if diagnostic is not None:
+            print(diagnostic.message)
+        if levels is not None:
             reports.append(levels)
-        except ValueError as ve:
-            print(f"Error parsing line {line_number}: '{line}'. {ve}")
-            continue
     return reports
 
 def is_monotonic(report: List[int]) -> bool:
@@ -27,10 +52,10 @@ def is_monotonic(report: List[int]) -> bool:
     decreasing = all(x > y for x, y in zip(report, report[1:]))
     return increasing or decreasing
 
-def has_valid_differences(report: List[int]) -> bool:
+def has_valid_differences(report: List[int], min_diff: int = 1, max_diff: int = 3) -> bool:
     for i in range(len(report) - 1):
         diff = abs(report[i+1] - report[i])
-        if diff < 1 or diff > 3:
+        if diff < min_diff or diff > max_diff:
             return False
     return True
 
@@ -72,22 +97,262 @@ def count_safe_reports_with_dampener(reports: List[List[int]]) -> int:
             safe_count += 1
     return safe_count
 
+def _first_violation(report: List[int], direction: int, skip: Optional[int] = None) -> int:
+    # Returns the index of the left level of the first adjacent pair (ignoring skip) whose
+    # step is not 1..3 in the given direction (+1 increasing, -1 decreasing), or -1 if none.
+    previous = None
+    for i, level in enumerate(report):
+        if i == skip:
+            continue
+        if previous is not None:
+            diff = (level - report[previous]) * direction
+            if diff < 1 or diff > 3:
+                return previous
+        previous = i
+    return -1
+
+def is_safe_report_with_dampener_fast(report: List[int]) -> bool:
+    # Linear-time equivalent of is_safe_report_with_dampener: for each direction, a
+    # violating pair (i, i+1) can only be fixed by removing i or i+1, so at most four
+    # copy-free rescans are needed.
+    if len(report) < 2:
+        return False
+    for direction in (1, -1):
+        violation = _first_violation(report, direction)
+        if violation == -1:
+            return True
+        if len(report) < 3:
+            continue
+        for skip in (violation, violation + 1):
+            if _first_violation(report, direction, skip) == -1:
+                return True
+    return False
+
+def count_safe_reports_with_dampener_fast(reports: List[List[int]]) -> int:
+    safe_count = 0
+    for report in reports:
+        if is_safe_report_with_dampener_fast(report):
+            safe_count += 1
+    return safe_count
+
+def _can_keep_chain(report: List[int], k: int, direction: int, min_diff: int, max_diff: int) -> bool:
+    # chains[i] is a bitmask of removal counts j such that some chain of at least two kept
+    # levels ends at i after removing j levels before it. A chain can only skip up to k
+    # levels between consecutive kept levels, so each i looks back at most k + 1 indices.
+    n = len(report)
+    full_mask = (1 << (k + 1)) - 1
+    chains = [0] * n
+    for i in range(n):
+        reachable = 0
+        for previous in range(max(0, i - k - 1), i):
+            diff = (report[i] - report[previous]) * direction
+            if diff < min_diff or diff > max_diff:
+                continue
+            gap = i - previous - 1
+            # The previous level either starts the chain (after removing all levels before
+            # it) or extends an existing chain.
+            starts = 1 << previous if previous <= k else 0
+            reachable |= (chains[previous] | starts) << gap
+        chains[i] = reachable & full_mask
+        trailing = n - 1 - i
+        if trailing <= k and chains[i] & ((1 << (k - trailing + 1)) - 1):
+            return True
+    return False
+
+def is_safe_report_with_k_dampener(report: List[int], k: int, min_diff: int = 1, max_diff: int = 3) -> bool:
+    if k < 0:
+        raise ValueError("k must be non-negative.")
+    if min_diff < 1:
+        raise ValueError("min_diff must be at least 1; safe reports are strictly increasing or decreasing.")
+    if len(report) < 2:
+        return False
+    return (_can_keep_chain(report, k, 1, min_diff, max_diff)
+            or _can_keep_chain(report, k, -1, min_diff, max_diff))
+
+def count_safe_reports_with_k_dampener(reports: List[List[int]], k: int, min_diff: int = 1, max_diff: int = 3) -> int:
+    safe_count = 0
+    for report in reports:
+        if is_safe_report_with_k_dampener(report, k, min_diff, max_diff):
+            safe_count += 1
+    return safe_count
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The CSR batch functions require numpy. Install it with 'pip install numpy'.")
+
+def reports_to_csr(reports: List[List[int]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    # Flattens reports into one levels array plus an offsets array where report i is
+    # levels[offsets[i]:offsets[i+1]].
+    _require_numpy()
+    lengths = np.fromiter((len(report) for report in reports), dtype=np.int64, count=len(reports))
+    offsets = np.zeros(len(reports) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    levels = array('q')
+    for report in reports:
+        levels.extend(report)
+    return np.frombuffer(levels, dtype=np.int64).copy(), offsets
+
+def _parse_input_csr_per_line(lines: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    levels = array('q')
+    offsets = array('q', [0])
+    for line_number, line in enumerate(lines, start=1):
+        report, diagnostic = _parse_report_line(line, line_number)
+        if diagnostic is not None:
+            print(diagnostic.message)
+        if report is not None:
+            levels.extend(report)
+            offsets.append(len(levels))
+    return np.frombuffer(levels, dtype=np.int64).copy(), np.frombuffer(offsets, dtype=np.int64).copy()
+
+_WHITESPACE_BYTES = b' \t\r\n\v\f'
+
+def _byte_table(members: bytes) -> "np.ndarray":
+    table = np.zeros(256, dtype=bool)
+    table[list(members)] = True
+    return table
+
+def parse_input_csr(input_data: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    # Parses the whole buffer at once: tokens are classified per byte, counted per line
+    # with bincount, and every kept line is parsed by a single np.fromstring call. Only
+    # lines that need a diagnostic go through _parse_report_line.
+    _require_numpy()
+    stripped = input_data.strip()
+    if not stripped:
+        return np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64)
+    data = stripped.encode()
+    raw = np.frombuffer(data, dtype=np.uint8)
+    is_newline = raw == ord('\n')
+    is_space = _byte_table(_WHITESPACE_BYTES)[raw]
+    is_digit = _byte_table(b'0123456789')[raw]
+    is_sign = _byte_table(b'+-')[raw]
+    token_start = ~is_space & np.concatenate(([True], is_space[:-1]))
+    next_is_digit = np.concatenate((is_digit[1:], [False]))
+    # A sign is only valid as the first byte of a token that continues with a digit
+    invalid = ~(is_space | is_digit | is_sign) | (is_sign & ~(token_start & next_is_digit))
+
+    line_of_byte = np.cumsum(is_newline, dtype=np.int32)
+    line_count = int(line_of_byte[-1]) + 1
+    tokens_per_line = np.bincount(line_of_byte[token_start], minlength=line_count)
+    if invalid.any():
+        bad_line = np.bincount(line_of_byte[invalid], minlength=line_count) > 0
+    else:
+        bad_line = np.zeros(line_count, dtype=bool)
+    keep = (tokens_per_line >= 2) & ~bad_line
+
+    diagnose = np.flatnonzero(~keep & (tokens_per_line > 0))
+    if diagnose.size:
+        newlines = np.flatnonzero(is_newline)
+        line_starts = np.concatenate(([0], newlines + 1))
+        line_ends = np.concatenate((newlines, [len(raw)]))
+        messages = []
+        for line_index in diagnose:
+            line = data[line_starts[line_index]:line_ends[line_index]].decode()
+            report, diagnostic = _parse_report_line(line, int(line_index) + 1)
+            if report is not None:
+                # int() accepted a token the byte classifier rejected (e.g. "1_000")
+                return _parse_input_csr_per_line(stripped.split('\n'))
+            messages.append(diagnostic.message)
+    else:
+        messages = []
+
+    kept_tokens = tokens_per_line[keep]
+    if keep.all():
+        levels = np.fromstring(stripped, dtype=np.int64, sep=' ')
+    elif kept_tokens.size:
+        cleaned = raw.copy()
+        cleaned[~keep[line_of_byte]] = ord(' ')
+        levels = np.fromstring(cleaned.tobytes().decode('ascii'), dtype=np.int64, sep=' ')
+    else:
+        levels = np.empty(0, dtype=np.int64)
+    if levels.size != int(kept_tokens.sum()):
+        return _parse_input_csr_per_line(stripped.split('\n'))
+    for message in messages:
+        print(message)
+    offsets = np.zeros(len(kept_tokens) + 1, dtype=np.int64)
+    np.cumsum(kept_tokens, out=offsets[1:])
+    return levels, offsets
+
+def _segment_all(condition: "np.ndarray", offsets: "np.ndarray") -> "np.ndarray":
+    # condition holds one entry per adjacent pair of the flat levels array; report i owns
+    # pairs offsets[i] .. offsets[i+1]-2. Pairs straddling two reports are never counted.
+    failures = np.zeros(len(condition) + 1, dtype=np.int64)
+    np.cumsum(~condition, out=failures[1:])
+    starts = offsets[:-1]
+    ends = np.maximum(offsets[1:] - 1, starts)
+    return failures[ends] == failures[starts]
+
+def batch_is_monotonic(levels: "np.ndarray", offsets: "np.ndarray") -> "np.ndarray":
+    _require_numpy()
+    diffs = np.diff(levels)
+    long_enough = np.diff(offsets) >= 2
+    return long_enough & (_segment_all(diffs > 0, offsets) | _segment_all(diffs < 0, offsets))
+
+def batch_has_valid_differences(levels: "np.ndarray", offsets: "np.ndarray", min_diff: int = 1, max_diff: int = 3) -> "np.ndarray":
+    _require_numpy()
+    steps = np.abs(np.diff(levels))
+    return _segment_all((steps >= min_diff) & (steps <= max_diff), offsets)
+
+def batch_is_safe(levels: "np.ndarray", offsets: "np.ndarray") -> "np.ndarray":
+    _require_numpy()
+    diffs = np.diff(levels)
+    long_enough = np.diff(offsets) >= 2
+    increasing = _segment_all((diffs >= 1) & (diffs <= 3), offsets)
+    decreasing = _segment_all((diffs <= -1) & (diffs >= -3), offsets)
+    return long_enough & (increasing | decreasing)
+
+def count_safe_reports_csr(levels: "np.ndarray", offsets: "np.ndarray") -> int:
+    return int(np.count_nonzero(batch_is_safe(levels, offsets)))
+
+def iter_reports(lines: Iterable[str], diagnostics: List[ReportDiagnostic]) -> Iterator[List[int]]:
+    # Lazily parses one report per line, recording skipped lines in diagnostics.
+    for line_number, line in enumerate(lines, start=1):
+        levels, diagnostic = _parse_report_line(line.rstrip('\n'), line_number)
+        if diagnostic is not None:
+            diagnostics.append(diagnostic)
+        if levels is not None:
+            yield levels
+
+def scan_reports(lines: Iterable[str]) -> ReportScanResult:
+    result = ReportScanResult()
+    for report in iter_reports(lines, result.diagnostics):
+        result.report_count += 1
+        if is_safe_report(report):
+            result.safe_count += 1
+            result.dampened_safe_count += 1
+        elif is_safe_report_with_dampener_fast(report):
+            result.dampened_safe_count += 1
+    result.skipped_lines = [diagnostic.line_number for diagnostic in result.diagnostics]
+    return result
+
+def scan_reports_file(input_file: str) -> ReportScanResult:
+    # Streams the file line by line and computes both parts in a single pass.
+    with open(input_file, 'r') as f:
+        return scan_reports(f)
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python reports.py <input_file> [--part2]")
+        print("Usage: python reports.py <input_file> [--part2|--both]")
         sys.exit(1)
     
     input_file = sys.argv[1]
     part = sys.argv[2] if len(sys.argv) > 2 else "1"
 
     try:
+        if part == "--both":
+            result = scan_reports_file(input_file)
+            for diagnostic in result.diagnostics:
+                print(diagnostic.message)
+            print(f"Number of Safe Reports (Part 1): {result.safe_count}")
+            print(f"Number of Safe Reports (Part 2): {result.dampened_safe_count}")
+            return
+
         with open(input_file, 'r') as f:
             input_data = f.read()
         
         reports = parse_input(input_data)
         
-        if part == "2":
-            safe_reports = count_safe_reports_with_dampener(reports)
+        if part in ("2", "--part2"):
+            safe_reports = count_safe_reports_with_dampener_fast(reports)
             print(f"Number of Safe Reports (Part 2): {safe_reports}")
         else:
             safe_reports = count_safe_reports(reports)
@@ -8,8 +8,28 @@ from day2_red_nosed_reports.reports import (
     is_safe_report,
     count_safe_reports,
     is_safe_report_with_dampener,
-    count_safe_reports_with_dampener
+    count_safe_reports_with_dampener,
+    is_safe_report_with_dampener_fast,
+    count_safe_reports_with_dampener_fast,
+    is_safe_report_with_k_dampener,
+    count_safe_reports_with_k_dampener,
+    reports_to_csr,
+    parse_input_csr,
+    batch_is_monotonic,
+    batch_has_valid_differences,
+    batch_is_safe,
+    count_safe_reports_csr,
+    scan_reports,
+    scan_reports_file
 )
+import itertools
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
 
 # Fixtures for common input data
 @pytest.fixture
@@ -243,4 +263,157 @@ def test_is_safe_report_with_dampener_part2_example():
     ]
     expected_count = 4
     actual = count_safe_reports_with_dampener(reports)
-    assert actual == expected_count, "Count of safe reports with dampener for example data is incorrect."
\ No newline at end of file
+    assert actual == expected_count, "Count of safe reports with dampener for example data is incorrect."
+
+# Tests for the linear-time dampener
+@pytest.mark.parametrize("report,expected", [
+    ([7, 6, 4, 2, 1], True),    # Already safe
+    ([1, 2, 7, 8, 9], False),   # Cannot be made safe by removing one level
+    ([9, 7, 6, 2, 1], False),   # Cannot be made safe by removing one level
+    ([1, 3, 2, 4, 5], True),    # Safe by removing 3
+    ([8, 6, 4, 4, 1], True),    # Safe by removing one 4
+    ([5, 3, 4, 2, 1], True),    # Safe by removing 3 or 4
+    ([9, 1, 2, 3, 4], True),    # Safe by removing the first level
+    ([1, 2, 3, 4, 9], True),    # Safe by removing the last level
+    ([3, 1, 2, 3, 4], True),    # Direction only becomes clear after removal
+    ([2], False),                # Single level
+    ([1, 1], False),             # Removing one leaves a single level
+    ([1, 2, 1], True),           # Safe by removing either 1
+    ([2, 2, 2], False),          # Cannot be made safe
+])
+def test_is_safe_report_with_dampener_fast(report, expected):
+    assert is_safe_report_with_dampener_fast(report) == expected, f"Fast dampener test failed for report: {report}"
+    assert is_safe_report_with_dampener(report) == expected, f"Reference dampener test failed for report: {report}"
+
+def test_is_safe_report_with_dampener_fast_matches_reference_exhaustive():
+    for length in range(1, 6):
+        for report in itertools.product(range(5), repeat=length):
+            report = list(report)
+            assert is_safe_report_with_dampener_fast(report) == is_safe_report_with_dampener(report), \
+                f"Fast dampener differs from reference for report: {report}"
+
+def test_count_safe_reports_with_dampener_fast(example_reports_part2):
+    expected_count = count_safe_reports_with_dampener(example_reports_part2)
+    assert count_safe_reports_with_dampener_fast(example_reports_part2) == expected_count, \
+        "Fast count of safe reports with dampener differs from reference."
+
+# Tests for the k-removal dampener
+def _is_safe_after_removals_brute_force(report, k, min_diff, max_diff):
+    for removed in range(k + 1):
+        for indices in itertools.combinations(range(len(report)), removed):
+            kept = [level for i, level in enumerate(report) if i not in indices]
+            if len(kept) >= 2 and is_monotonic(kept) and has_valid_differences(kept, min_diff, max_diff):
+                return True
+    return False
+
+@pytest.mark.parametrize("report,k,expected", [
+    ([1, 2, 7, 8, 9], 1, False),   # Needs the jump of 5 removed, which one removal cannot fix
+    ([1, 2, 7, 8, 9], 2, True),    # Safe by removing 1 and 2
+    ([1, 9, 9, 2, 3], 2, True),    # Safe by removing both 9s
+    ([1, 9, 9, 2, 3], 1, False),   # One removal is not enough
+    ([5, 1, 9, 2, 3, 4], 2, True), # Safe by removing 5 and 9
+    ([1, 1], 3, False),            # At least two levels must remain
+    ([4, 4, 4, 5], 2, True),       # Safe by removing two 4s
+])
+def test_is_safe_report_with_k_dampener(report, k, expected):
+    assert is_safe_report_with_k_dampener(report, k) == expected, f"k-dampener test failed for report: {report}, k={k}"
+
+def test_is_safe_report_with_k_dampener_custom_bounds():
+    assert is_safe_report_with_k_dampener([1, 5, 9], 0, min_diff=1, max_diff=4), "Differences of 4 should be allowed."
+    assert not is_safe_report_with_k_dampener([1, 2, 6], 0, min_diff=2, max_diff=4), "Difference of 1 should be rejected."
+    assert is_safe_report_with_k_dampener([1, 2, 6], 1, min_diff=2, max_diff=5), "Removing 2 leaves a difference of 5."
+
+def test_is_safe_report_with_k_dampener_matches_brute_force():
+    for length in range(1, 6):
+        for report in itertools.product(range(4), repeat=length):
+            report = list(report)
+            for k in range(3):
+                assert is_safe_report_with_k_dampener(report, k) == _is_safe_after_removals_brute_force(report, k, 1, 3), \
+                    f"k-dampener differs from brute force for report: {report}, k={k}"
+
+def test_count_safe_reports_with_k_dampener_matches_existing_parts(example_reports_part2):
+    assert count_safe_reports_with_k_dampener(example_reports_part2, 0) == count_safe_reports(example_reports_part2), \
+        "k=0 should match Part 1."
+    assert count_safe_reports_with_k_dampener(example_reports_part2, 1) == count_safe_reports_with_dampener(example_reports_part2), \
+        "k=1 should match Part 2."
+
+def test_is_safe_report_with_k_dampener_negative_k():
+    with pytest.raises(ValueError):
+        is_safe_report_with_k_dampener([1, 2, 3], -1)
+
+@pytest.mark.parametrize("min_diff", [0, -1])
+def test_is_safe_report_with_k_dampener_rejects_non_strict_bounds(min_diff):
+    # Equal neighbours are never monotonic, so a zero minimum difference is meaningless
+    with pytest.raises(ValueError):
+        is_safe_report_with_k_dampener([2, 2, 2], 0, min_diff=min_diff, max_diff=0)
+    with pytest.raises(ValueError):
+        count_safe_reports_with_k_dampener([[2, 2, 2]], 1, min_diff=min_diff)
+
+# Tests for the CSR batch representation
+@requires_numpy
+def test_parse_input_csr():
+    input_data = """
+    7 6 4 2 1
+
+    1 2 7 8
+    5
+    9 7 6 2 1 0
+    """
+    levels, offsets = parse_input_csr(input_data)
+    assert levels.tolist() == [7, 6, 4, 2, 1, 1, 2, 7, 8, 9, 7, 6, 2, 1, 0], "Flat levels do not match expected output."
+    assert offsets.tolist() == [0, 5, 9, 15], "Offsets do not match expected output."
+
+@requires_numpy
+@pytest.mark.parametrize("input_data", [
+    "1 2 3\n4 x 6\n7 8 9",
+    "1 -2 3\n4 - 6\n+7 8\n9-1 2",
+    "1_0 2 3\n4 5",
+    "5\n\n\n",
+    "1 2\t3\r\n4 5 6\r\n",
+])
+def test_parse_input_csr_matches_parse_input(input_data, capsys):
+    expected = parse_input(input_data)
+    expected_output = capsys.readouterr().out
+    levels, offsets = parse_input_csr(input_data)
+    reports = [levels[start:end].tolist() for start, end in zip(offsets[:-1], offsets[1:])]
+    assert reports == expected, "CSR parse should keep the same reports as parse_input."
+    assert capsys.readouterr().out == expected_output, "CSR parse should print the same diagnostics."
+
+@requires_numpy
+def test_batch_functions_match_reference():
+    reports = [list(report) for length in range(0, 5) for report in itertools.product(range(5), repeat=length)]
+    levels, offsets = reports_to_csr(reports)
+    assert batch_is_monotonic(levels, offsets).tolist() == [is_monotonic(r) for r in reports], \
+        "Batch monotonicity differs from reference."
+    assert batch_has_valid_differences(levels, offsets).tolist() == [has_valid_differences(r) for r in reports], \
+        "Batch difference validity differs from reference."
+    assert batch_is_safe(levels, offsets).tolist() == [is_safe_report(r) for r in reports], \
+        "Batch safety differs from reference."
+
+@requires_numpy
+def test_count_safe_reports_csr(example_reports_part1):
+    levels, offsets = reports_to_csr(example_reports_part1)
+    assert count_safe_reports_csr(levels, offsets) == 2, "CSR count of safe reports is incorrect."
+
+@requires_numpy
+def test_count_safe_reports_csr_empty():
+    levels, offsets = reports_to_csr([])
+    assert count_safe_reports_csr(levels, offsets) == 0, "CSR count of no reports should be 0."
+
+# Tests for the streaming single-pass scanner
+def test_scan_reports_file_both_parts(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("7 6 4 2 1\n1 2 7 8 9\n9 7 6 2 1\n1 3 2 4 5\n8 6 4 4 1\n1 3 6 7 9\n")
+    result = scan_reports_file(str(input_file))
+    assert result.report_count == 6, "Every valid line should be counted as a report."
+    assert result.safe_count == 2, "Part 1 count from the streaming scan is incorrect."
+    assert result.dampened_safe_count == 4, "Part 2 count from the streaming scan is incorrect."
+    assert result.skipped_lines == [], "No lines should be skipped."
+
+def test_scan_reports_collects_diagnostics(capsys):
+    lines = ["7 6 4 2 1\n", "\n", "5\n", "1 x 3\n", "1 3 2 4 5\n"]
+    result = scan_reports(lines)
+    assert result.safe_count == 1 and result.dampened_safe_count == 2, "Counts should ignore skipped lines."
+    assert result.skipped_lines == [3, 4], "Skipped line numbers are incorrect."
+    assert [d.severity for d in result.diagnostics] == ["warning", "error"], "Diagnostic severities are incorrect."
+    assert capsys.readouterr().out == "", "The streaming scan should not print diagnostics."
@@ -1,84 +1,522 @@
 # day3_corrupted_memory/memory.py
 
+import json
+import mmap
+import os
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
 
-def compute_similarity_sum_part1(corrupted_memory: str) -> int:
+# Scanner states for the byte-level state machine
+_IDLE = 0
+_M, _MU, _MUL, _MUL_X, _MUL_Y = 1, 2, 3, 4, 5
+_D, _DO, _DO_OPEN, _DON, _DON_QUOTE, _DONT, _DONT_OPEN = 6, 7, 8, 9, 10, 11, 12
+
+_CH_M, _CH_U, _CH_L, _CH_O, _CH_N, _CH_T = (ord(c) for c in "mulont")
+_CH_QUOTE, _CH_OPEN, _CH_CLOSE, _CH_COMMA = (ord(c) for c in "'(),")
+_CH_0, _CH_9 = ord('0'), ord('9')
+
+# Longest instruction is mul(999,999); chunks read this many bytes past their end
+_TOKEN_OVERLAP = len("mul(999,999)") - 1
+
+class ChunkSummary(NamedTuple):
+    """
+    Mergeable result of scanning one chunk of the corrupted memory.
+
+    Attributes:
+        part1_sum (int): Sum of all mul(X,Y) products starting in the chunk.
+        sum_if_enabled (int): Part Two sum if the chunk starts with mul enabled.
+        sum_if_disabled (int): Part Two sum if the chunk starts with mul disabled.
+        final_enabled (Optional[bool]): Enable state at the end of the chunk, or None if
+            the chunk contains no do()/don't() and passes its starting state through.
+    """
+    part1_sum: int
+    sum_if_enabled: int
+    sum_if_disabled: int
+    final_enabled: Optional[bool]
+
+class MemoryEvent(NamedTuple):
+    """
+    A single instruction reported to an event sink.
+
+    Attributes:
+        kind (str): One of "mul" (Part One), "enabled_mul", "disabled_mul", "do" or "dont".
+        x (int): First mul operand (0 for do() and don't()).
+        y (int): Second mul operand (0 for do() and don't()).
+        text (str): The mul instruction exactly as written, leading zeros included
+            (empty when the scan does not record it).
+    """
+    kind: str
+    x: int = 0
+    y: int = 0
+    text: str = ""
+
+class CounterSink:
+    """Event sink that only counts events per kind."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def __call__(self, event: MemoryEvent) -> None:
+        self.counts[event.kind] += 1
+
+class ListSink:
+    """Event sink that records every event in order."""
+
+    def __init__(self):
+        self.events: List[MemoryEvent] = []
+
+    def __call__(self, event: MemoryEvent) -> None:
+        self.events.append(event)
+
+def print_sink(event: MemoryEvent) -> None:
+    """
+    Event sink that prints each instruction in the original trace format.
+
+    Parameters:
+    - event (MemoryEvent): The instruction to print.
+    """
+    x, y = event.x, event.y
+    if event.kind == "mul":
+        print(f"Found mul({x},{y}) → {x} * {y} = {x * y}")
+    elif event.kind == "enabled_mul":
+        print(f"Enabled mul({x},{y}) → {x} * {y} = {x * y}")
+    elif event.kind == "disabled_mul":
+        # The original trace echoed disabled operands as written
+        print(f"Disabled {event.text or f'mul({x},{y})'} → Ignored")
+    elif event.kind == "do":
+        print("Instruction do() encountered → mul instructions enabled.")
+    elif event.kind == "dont":
+        print("Instruction don't() encountered → mul instructions disabled.")
+
+EventSink = Callable[[MemoryEvent], None]
+
+# Regex patterns for valid mul(X,Y) instructions, and for mul(X,Y), do() and don't()
+MUL_PATTERN = re.compile(r'mul\((\d{1,3}),(\d{1,3})\)')
+INSTRUCTION_PATTERN = re.compile(r'mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don\'t\(\)')
+INSTRUCTION_BYTES_PATTERN = re.compile(rb'mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don\'t\(\)')
+
+def compute_similarity_sum_part1(corrupted_memory: str, sink: Optional[EventSink] = None) -> int:
     """
     Scans the corrupted memory for valid mul(X,Y) instructions and returns the sum of all multiplications.
     
     Parameters:
     - corrupted_memory (str): The string representing the corrupted memory.
+    - sink (Optional[EventSink]): Called with a MemoryEvent for every instruction found.
     
     Returns:
     - int: The total sum of all valid multiplications.
     """
-    # Define the regex pattern for valid mul(X,Y) instructions
-    pattern = r'mul\((\d{1,3}),(\d{1,3})\)'
-    
-    # Find all matches in the corrupted memory
-    matches = re.findall(pattern, corrupted_memory)
-    
     total_sum = 0
-    for x_str, y_str in matches:
+    for x_str, y_str in MUL_PATTERN.findall(corrupted_memory):
         x = int(x_str)
         y = int(y_str)
-        product = x * y
-        total_sum += product
-        print(f"Found mul({x},{y}) → {x} * {y} = {product}")
+        total_sum += x * y
+        if sink is not None:
+            sink(MemoryEvent("mul", x, y))
     
     return total_sum
 
-def compute_similarity_sum_part2(corrupted_memory: str) -> int:
+def _sum_instructions(matches, sink: Optional[EventSink]) -> Tuple[int, int]:
+    # Shared by the str and bytes scans: group(1) is only set for mul(X,Y), and do()
+    # and don't() differ in their third character.
+    part1_sum = 0
+    part2_sum = 0
+    mul_enabled = True  # Initial state: mul instructions are enabled
+    for match in matches:
+        x_str = match.group(1)
+        if x_str is not None:
+            x = int(x_str)
+            y = int(match.group(2))
+            product = x * y
+            part1_sum += product
+            if mul_enabled:
+                part2_sum += product
+            if sink is not None:
+                text = match.group(0)
+                if isinstance(text, bytes):
+                    text = text.decode('ascii')
+                sink(MemoryEvent("enabled_mul" if mul_enabled else "disabled_mul", x, y, text))
+        else:
+            mul_enabled = match.end() - match.start() == 4  # do() vs don't()
+            if sink is not None:
+                sink(MemoryEvent("do" if mul_enabled else "dont"))
+    return part1_sum, part2_sum
+
+def compute_similarity_sum_part2(corrupted_memory: str, sink: Optional[EventSink] = None) -> int:
     """
     Scans the corrupted memory for valid mul(X,Y), do(), and don't() instructions.
     Calculates the sum of all enabled mul(X,Y) multiplications based on the current state.
     
     Parameters:
     - corrupted_memory (str): The string representing the corrupted memory.
+    - sink (Optional[EventSink]): Called with a MemoryEvent for every instruction found.
     
     Returns:
     - int: The total sum of all enabled multiplications.
     """
-    # Define the regex pattern for mul(X,Y), do(), and don't() instructions
-    # The pattern uses named groups to identify the type of instruction
-    pattern = r'mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don\'t\(\)'
-    
-    # Find all matches in the corrupted memory in order
-    matches = re.finditer(pattern, corrupted_memory)
-    
-    mul_enabled = True  # Initial state: mul instructions are enabled
-    total_sum = 0
-    
-    for match in matches:
-        if match.group(0).startswith('mul'):
-            # It's a mul(X,Y) instruction
-            x_str, y_str = match.group(1), match.group(2)
-            if mul_enabled:
-                x = int(x_str)
-                y = int(y_str)
-                product = x * y
-                total_sum += product
-                print(f"Enabled mul({x},{y}) → {x} * {y} = {product}")
-            else:
-                print(f"Disabled mul({match.group(1)},{match.group(2)}) → Ignored")
-        elif match.group(0) == 'do()':
-            mul_enabled = True
-            print("Instruction do() encountered → mul instructions enabled.")
-        elif match.group(0) == "don't()":
-            mul_enabled = False
-            print("Instruction don't() encountered → mul instructions disabled.")
-    
+    _, total_sum = _sum_instructions(INSTRUCTION_PATTERN.finditer(corrupted_memory), sink)
     return total_sum
 
+def scan_memory_mmap(input_file: str, sink: Optional[EventSink] = None) -> Tuple[int, int]:
+    """
+    Memory-maps the file and runs the compiled bytes pattern directly over the mapping.
+
+    Parameters:
+    - input_file (str): Path to the corrupted memory file.
+    - sink (Optional[EventSink]): Called with a MemoryEvent for every instruction found.
+
+    Returns:
+    - Tuple[int, int]: The Part One and Part Two sums.
+    """
+    with open(input_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _sum_instructions(INSTRUCTION_BYTES_PATTERN.finditer(mapped), sink)
+
+class MemoryScanner:
+    """
+    Regex-free state machine that recognizes mul(X,Y), do() and don't() in a byte stream.
+
+    Bytes can be fed in arbitrary chunks: the scanner state (including a partially read
+    token) carries over between calls to feed, so tokens straddling chunk boundaries are
+    recognized. No token prefix contains an 'm' or 'd' after its first byte, so on a
+    mismatch only the current byte needs to be re-examined as a possible token start.
+
+    Attributes:
+        part1_sum (int): Sum of all mul(X,Y) products.
+        part2_sum (int): Sum of mul(X,Y) products while mul instructions are enabled.
+        mul_enabled (bool): Whether mul instructions are currently enabled.
+        leading_sum (int): Sum of mul(X,Y) products seen before the first do() or don't().
+        toggled (bool): Whether any do() or don't() has been seen.
+        offset (int): Total number of bytes fed so far.
+
+    The whole scanner state, including a partial token at the tail, is a handful of
+    integers, so it can be checkpointed with save_checkpoint and later continued with
+    resume to process only the bytes appended to a growing log.
+    """
+
+    def __init__(self):
+        self.part1_sum = 0
+        self.part2_sum = 0
+        self.mul_enabled = True
+        self.leading_sum = 0
+        self.toggled = False
+        self.offset = 0
+        self._state = _IDLE
+        self._x = 0
+        self._y = 0
+        self._digits = 0
+
+    def feed(self, data: bytes, token_limit: Optional[int] = None) -> None:
+        """
+        Advances the state machine over the next chunk of bytes.
+
+        Parameters:
+        - data (bytes): The next chunk of the corrupted memory.
+        - token_limit (Optional[int]): If given, tokens starting at or after this offset
+          are ignored; bytes past it are only used to complete a token already in progress.
+        """
+        state, x, y, digits = self._state, self._x, self._y, self._digits
+        part1_sum, part2_sum, mul_enabled = self.part1_sum, self.part2_sum, self.mul_enabled
+        leading_sum, toggled = self.leading_sum, self.toggled
+        n = len(data)
+        limit = n if token_limit is None else token_limit
+        next_m = next_d = -2
+        i = 0
+        while i < n:
+            if state == _IDLE:
+                # Skip straight to the next byte that can start a token
+                if next_m != -1 and next_m < i:
+                    next_m = data.find(b'm', i)
+                if next_d != -1 and next_d < i:
+                    next_d = data.find(b'd', i)
+                if next_m == -1 and next_d == -1:
+                    break
+                i = next_d if next_m == -1 or (next_d != -1 and next_d < next_m) else next_m
+                if i >= limit:
+                    break
+                state = _M if data[i] == _CH_M else _D
+                i += 1
+                continue
+
+            c = data[i]
+            if state == _M:
+                state = _MU if c == _CH_U else _IDLE
+            elif state == _MU:
+                state = _MUL if c == _CH_L else _IDLE
+            elif state == _MUL:
+                if c == _CH_OPEN:
+                    state, x, digits = _MUL_X, 0, 0
+                else:
+                    state = _IDLE
+            elif state == _MUL_X:
+                if _CH_0 <= c <= _CH_9 and digits < 3:
+                    x, digits = x * 10 + c - _CH_0, digits + 1
+                elif c == _CH_COMMA and digits:
+                    state, y, digits = _MUL_Y, 0, 0
+                else:
+                    state = _IDLE
+            elif state == _MUL_Y:
+                if _CH_0 <= c <= _CH_9 and digits < 3:
+                    y, digits = y * 10 + c - _CH_0, digits + 1
+                elif c == _CH_CLOSE and digits:
+                    product = x * y
+                    part1_sum += product
+                    if mul_enabled:
+                        part2_sum += product
+                    if not toggled:
+                        leading_sum += product
+                    state = _IDLE
+                    i += 1
+                    continue
+                else:
+                    state = _IDLE
+            elif state == _D:
+                state = _DO if c == _CH_O else _IDLE
+            elif state == _DO:
+                state = _DO_OPEN if c == _CH_OPEN else _DON if c == _CH_N else _IDLE
+            elif state == _DO_OPEN:
+                if c == _CH_CLOSE:
+                    mul_enabled, toggled = True, True
+                    state = _IDLE
+                    i += 1
+                    continue
+                state = _IDLE
+            elif state == _DON:
+                state = _DON_QUOTE if c == _CH_QUOTE else _IDLE
+            elif state == _DON_QUOTE:
+                state = _DONT if c == _CH_T else _IDLE
+            elif state == _DONT:
+                state = _DONT_OPEN if c == _CH_OPEN else _IDLE
+            elif state == _DONT_OPEN:
+                if c == _CH_CLOSE:
+                    mul_enabled, toggled = False, True
+                    state = _IDLE
+                    i += 1
+                    continue
+                state = _IDLE
+
+            if state != _IDLE:
+                i += 1
+            # On a mismatch the state is _IDLE and the same byte is re-examined
+
+        self._state, self._x, self._y, self._digits = state, x, y, digits
+        self.part1_sum, self.part2_sum, self.mul_enabled = part1_sum, part2_sum, mul_enabled
+        self.leading_sum, self.toggled = leading_sum, toggled
+        self.offset += n
+
+    def resume(self, input_file: str, chunk_size: int = 1 << 20) -> None:
+        """
+        Feeds the bytes appended to the file since the last scanned offset.
+
+        Parameters:
+        - input_file (str): Path to the append-only corrupted memory log.
+        - chunk_size (int): Number of bytes read per chunk.
+        """
+        with open(input_file, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self.offset:
+                raise ValueError(
+                    f"The file '{input_file}' is shorter than the checkpointed offset {self.offset}; "
+                    "it was truncated or replaced."
+                )
+            f.seek(self.offset)
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                self.feed(chunk)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the complete scanner state as a JSON-serializable dict.
+        """
+        return {
+            "offset": self.offset,
+            "part1_sum": self.part1_sum,
+            "part2_sum": self.part2_sum,
+            "mul_enabled": self.mul_enabled,
+            "leading_sum": self.leading_sum,
+            "toggled": self.toggled,
+            "state": self._state,
+            "x": self._x,
+            "y": self._y,
+            "digits": self._digits,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MemoryScanner":
+        """
+        Restores a scanner from the dict produced by to_dict.
+        """
+        scanner = cls()
+        scanner.offset = data["offset"]
+        scanner.part1_sum = data["part1_sum"]
+        scanner.part2_sum = data["part2_sum"]
+        scanner.mul_enabled = data["mul_enabled"]
+        scanner.leading_sum = data["leading_sum"]
+        scanner.toggled = data["toggled"]
+        scanner._state = data["state"]
+        scanner._x = data["x"]
+        scanner._y = data["y"]
+        scanner._digits = data["digits"]
+        return scanner
+
+    def save_checkpoint(self, checkpoint_file: str) -> None:
+        """
+        Atomically writes the scanner state to a small JSON checkpoint file.
+
+        Parameters:
+        - checkpoint_file (str): Path to the checkpoint file.
+        """
+        temp_file = f"{checkpoint_file}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_file, checkpoint_file)
+
+    @classmethod
+    def load_checkpoint(cls, checkpoint_file: str) -> "MemoryScanner":
+        """
+        Restores a scanner from a checkpoint file, or returns a fresh one if it does not exist.
+
+        Parameters:
+        - checkpoint_file (str): Path to the checkpoint file.
+        """
+        try:
+            with open(checkpoint_file, 'r') as f:
+                return cls.from_dict(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+def scan_memory_stream(stream, chunk_size: int = 1 << 20) -> Tuple[int, int]:
+    """
+    Scans a binary stream chunk by chunk and returns both sums in a single pass.
+
+    Parameters:
+    - stream: A binary file-like object.
+    - chunk_size (int): Number of bytes read per chunk.
+
+    Returns:
+    - Tuple[int, int]: The Part One and Part Two sums.
+    """
+    scanner = MemoryScanner()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        scanner.feed(chunk)
+    return scanner.part1_sum, scanner.part2_sum
+
+def scan_memory_file(input_file: str, chunk_size: int = 1 << 20) -> Tuple[int, int]:
+    """
+    Scans the file in binary chunks and returns the Part One and Part Two sums.
+
+    Parameters:
+    - input_file (str): Path to the corrupted memory file.
+    - chunk_size (int): Number of bytes read per chunk.
+
+    Returns:
+    - Tuple[int, int]: The Part One and Part Two sums.
+    """
+    with open(input_file, 'rb') as f:
+        return scan_memory_stream(f, chunk_size)
+
+def scan_memory_chunk(input_file: str, start: int, end: int) -> ChunkSummary:
+    """
+    Scans the tokens that start in the byte range [start, end) of the file.
+
+    No instruction can start inside another one, so scanning from an idle state at an
+    arbitrary offset finds exactly the instructions starting there; reading a few bytes
+    past end completes an instruction that straddles the boundary.
+
+    Parameters:
+    - input_file (str): Path to the corrupted memory file.
+    - start (int): First byte offset of the chunk.
+    - end (int): Byte offset one past the end of the chunk.
+
+    Returns:
+    - ChunkSummary: The mergeable summary of the chunk.
+    """
+    with open(input_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start + _TOKEN_OVERLAP)
+    scanner = MemoryScanner()
+    scanner.feed(data, token_limit=end - start)
+    return ChunkSummary(
+        part1_sum=scanner.part1_sum,
+        sum_if_enabled=scanner.part2_sum,
+        sum_if_disabled=scanner.part2_sum - scanner.leading_sum,
+        final_enabled=scanner.mul_enabled if scanner.toggled else None,
+    )
+
+def combine_chunk_summaries(summaries: Iterable[ChunkSummary]) -> Tuple[int, int]:
+    """
+    Combines chunk summaries in file order into the exact global sums.
+
+    Parameters:
+    - summaries (Iterable[ChunkSummary]): Summaries of consecutive chunks.
+
+    Returns:
+    - Tuple[int, int]: The Part One and Part Two sums.
+    """
+    part1_sum = 0
+    part2_sum = 0
+    mul_enabled = True
+    for summary in summaries:
+        part1_sum += summary.part1_sum
+        part2_sum += summary.sum_if_enabled if mul_enabled else summary.sum_if_disabled
+        if summary.final_enabled is not None:
+            mul_enabled = summary.final_enabled
+    return part1_sum, part2_sum
+
+def scan_memory_file_parallel(input_file: str, workers: Optional[int] = None,
+                              chunk_count: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Scans the file in parallel chunks and merges the chunk summaries in order.
+
+    Parameters:
+    - input_file (str): Path to the corrupted memory file.
+    - workers (Optional[int]): Number of worker processes (defaults to the CPU count).
+    - chunk_count (Optional[int]): Number of chunks (defaults to the number of workers).
+
+    Returns:
+    - Tuple[int, int]: The Part One and Part Two sums.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_count = chunk_count or workers
+    size = os.path.getsize(input_file)
+    boundaries = sorted({size * i // chunk_count for i in range(chunk_count + 1)})
+    starts, ends = boundaries[:-1], boundaries[1:]
+    if not starts:
+        return 0, 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as executor:
+        summaries = executor.map(scan_memory_chunk, [input_file] * len(starts), starts, ends)
+        return combine_chunk_summaries(summaries)
+
 def main():
     if len(sys.argv) < 2 or len(sys.argv) > 3:
-        print("Usage: python memory.py <input_file> [--part2]")
+        print("Usage: python memory.py <input_file> [--part2|--stream|--parallel|--mmap]")
         sys.exit(1)
     
     input_file = sys.argv[1]
     part = sys.argv[2] if len(sys.argv) == 3 else "1"
     
+    if part in ("--stream", "--parallel", "--mmap"):
+        scan = {"--stream": scan_memory_file, "--parallel": scan_memory_file_parallel,
+                "--mmap": scan_memory_mmap}[part]
+        try:
+            part1_sum, part2_sum = scan(input_file)
+        except FileNotFoundError:
+            print(f"Error: The file '{input_file}' was not found.")
+            sys.exit(1)
+        print(f"Total Similarity Sum (Part One): {part1_sum}")
+        print(f"Total Similarity Sum (Part Two): {part2_sum}")
+        return
+    
     try:
         with open(input_file, 'r') as f:
             corrupted_memory = f.read()
@@ -91,10 +529,10 @@ def main():
     
     if part == "--part2":
         print("Running Part Two: Handling do() and don't() instructions.\n")
-        total_similarity_sum = compute_similarity_sum_part2(corrupted_memory)
+        total_similarity_sum = compute_similarity_sum_part2(corrupted_memory, sink=print_sink)
     else:
         print("Running Part One: Summing all valid mul(X,Y) instructions.\n")
-        total_similarity_sum = compute_similarity_sum_part1(corrupted_memory)
+        total_similarity_sum = compute_similarity_sum_part1(corrupted_memory, sink=print_sink)
     
     print(f"\nTotal Similarity Sum: {total_similarity_sum}")
 
@@ -0,0 +1,177 @@
+# day3_corrupted_memory/tests/test_memory.py
+
+import io
+import pytest
+from day3_corrupted_memory.memory import (
+    compute_similarity_sum_part1,
+    compute_similarity_sum_part2,
+    MemoryEvent,
+    CounterSink,
+    ListSink,
+    print_sink,
+    scan_memory_mmap,
+    MemoryScanner,
+    scan_memory_stream,
+    scan_memory_file,
+    scan_memory_chunk,
+    combine_chunk_summaries,
+    scan_memory_file_parallel
+)
+
+SAMPLE = "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+
+# Instructions split across chunk boundaries, toggles in several chunks and near-miss tokens
+TRICKY = (
+    "mul(123,4)don't()mul(1,1)mmul(2,3)do()dodo()mul(999,999)"
+    "don'tmul(5,5)don't()do(mul(7,7)don't()mul(1000,2)mul(8,8)do()mul(6,0)"
+)
+
+@pytest.fixture
+def sample_file(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(SAMPLE + TRICKY)
+    return str(input_file)
+
+# Tests for the regex reference implementation
+def test_compute_similarity_sum_part1():
+    assert compute_similarity_sum_part1(SAMPLE) == 161, "Part 1 sum of the sample is incorrect."
+
+def test_compute_similarity_sum_part2():
+    assert compute_similarity_sum_part2(SAMPLE) == 48, "Part 2 sum of the sample is incorrect."
+
+# Tests for the event sinks
+def test_list_sink_part1_events():
+    sink = ListSink()
+    compute_similarity_sum_part1(SAMPLE, sink=sink)
+    assert sink.events == [
+        MemoryEvent("mul", 2, 4), MemoryEvent("mul", 5, 5), MemoryEvent("mul", 11, 8), MemoryEvent("mul", 8, 5),
+    ], "Part 1 events of the sample are incorrect."
+
+def test_list_sink_part2_events():
+    sink = ListSink()
+    compute_similarity_sum_part2(SAMPLE, sink=sink)
+    assert sink.events == [
+        MemoryEvent("enabled_mul", 2, 4, "mul(2,4)"),
+        MemoryEvent("dont"),
+        MemoryEvent("disabled_mul", 5, 5, "mul(5,5)"),
+        MemoryEvent("disabled_mul", 11, 8, "mul(11,8)"),
+        MemoryEvent("do"),
+        MemoryEvent("enabled_mul", 8, 5, "mul(8,5)"),
+    ], "Part 2 events of the sample are incorrect."
+
+def test_counter_sink():
+    sink = CounterSink()
+    compute_similarity_sum_part2(SAMPLE + TRICKY, sink=sink)
+    events = ListSink()
+    compute_similarity_sum_part2(SAMPLE + TRICKY, sink=events)
+    assert sink.counts == {kind: [event.kind for event in events.events].count(kind)
+                           for kind in ("enabled_mul", "disabled_mul", "do", "dont")}, \
+        "Counter sink should count every event kind."
+
+def test_print_sink_reproduces_trace(capsys):
+    compute_similarity_sum_part1(SAMPLE, sink=print_sink)
+    compute_similarity_sum_part2(SAMPLE + "don't()mul(007,08)do()mul(010,2)", sink=print_sink)
+    assert capsys.readouterr().out.splitlines() == [
+        "Found mul(2,4) → 2 * 4 = 8",
+        "Found mul(5,5) → 5 * 5 = 25",
+        "Found mul(11,8) → 11 * 8 = 88",
+        "Found mul(8,5) → 8 * 5 = 40",
+        "Enabled mul(2,4) → 2 * 4 = 8",
+        "Instruction don't() encountered → mul instructions disabled.",
+        "Disabled mul(5,5) → Ignored",
+        "Disabled mul(11,8) → Ignored",
+        "Instruction do() encountered → mul instructions enabled.",
+        "Enabled mul(8,5) → 8 * 5 = 40",
+        "Instruction don't() encountered → mul instructions disabled.",
+        "Disabled mul(007,08) → Ignored",
+        "Instruction do() encountered → mul instructions enabled.",
+        "Enabled mul(10,2) → 10 * 2 = 20",
+    ], "Printed trace differs from the original output."
+
+# Tests for the memory-mapped scan
+def test_scan_memory_mmap(sample_file):
+    memory = SAMPLE + TRICKY
+    sink = ListSink()
+    expected_events = ListSink()
+    compute_similarity_sum_part2(memory, sink=expected_events)
+    assert scan_memory_mmap(sample_file, sink=sink) == \
+        (compute_similarity_sum_part1(memory), compute_similarity_sum_part2(memory)), \
+        "Memory-mapped scan differs from the regex reference."
+    assert sink.events == expected_events.events, "Memory-mapped scan should report the same events as Part 2."
+
+def test_scan_memory_mmap_empty_file(tmp_path):
+    input_file = tmp_path / "empty.txt"
+    input_file.write_bytes(b"")
+    sink = ListSink()
+    assert scan_memory_mmap(str(input_file), sink=sink) == (0, 0), "Empty file should give zero sums."
+    assert sink.events == [], "Empty file should report no events."
+
+# Tests for the streaming scanner
+@pytest.mark.parametrize("memory", [SAMPLE, TRICKY, SAMPLE + TRICKY])
+def test_scan_memory_stream_every_chunk_size(memory):
+    expected = (compute_similarity_sum_part1(memory), compute_similarity_sum_part2(memory))
+    data = memory.encode()
+    for chunk_size in range(1, len(data) + 1):
+        assert scan_memory_stream(io.BytesIO(data), chunk_size) == expected, \
+            f"Streaming scan with chunk_size={chunk_size} differs from the regex reference."
+
+def test_scan_memory_file(sample_file):
+    memory = SAMPLE + TRICKY
+    expected = (compute_similarity_sum_part1(memory), compute_similarity_sum_part2(memory))
+    assert scan_memory_file(sample_file, chunk_size=7) == expected, "File scan differs from the regex reference."
+
+def test_scan_memory_stream_empty():
+    assert scan_memory_stream(io.BytesIO(b"")) == (0, 0), "Empty input should give zero sums."
+
+# Tests for the chunk summaries
+def test_combine_chunk_summaries(sample_file):
+    memory = SAMPLE + TRICKY
+    expected = (compute_similarity_sum_part1(memory), compute_similarity_sum_part2(memory))
+    size = len(memory.encode())
+    for chunk_count in (1, 2, 3, 5, 8, 13, size):
+        boundaries = [size * i // chunk_count for i in range(chunk_count + 1)]
+        summaries = [scan_memory_chunk(sample_file, start, end) for start, end in zip(boundaries[:-1], boundaries[1:])]
+        assert combine_chunk_summaries(summaries) == expected, \
+            f"Combined summaries with chunk_count={chunk_count} differ from the regex reference."
+
+def test_combine_chunk_summaries_empty():
+    assert combine_chunk_summaries([]) == (0, 0), "No summaries should give zero sums."
+
+def test_scan_memory_file_parallel(sample_file):
+    memory = SAMPLE + TRICKY
+    expected = (compute_similarity_sum_part1(memory), compute_similarity_sum_part2(memory))
+    assert scan_memory_file_parallel(sample_file, workers=2, chunk_count=6) == expected, \
+        "Parallel scan differs from the regex reference."
+
+# Tests for checkpoint and resume
+def test_checkpoint_resume_across_split_token(tmp_path):
+    memory = SAMPLE + TRICKY
+    split = memory.index("mul(999,999)") + len("mul(99")
+    input_file = tmp_path / "input.txt"
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    input_file.write_text(memory[:split])
+
+    scanner = MemoryScanner.load_checkpoint(checkpoint_file)
+    scanner.resume(str(input_file), chunk_size=5)
+    scanner.save_checkpoint(checkpoint_file)
+
+    with open(input_file, 'a') as f:
+        f.write(memory[split:])
+    scanner = MemoryScanner.load_checkpoint(checkpoint_file)
+    scanner.resume(str(input_file), chunk_size=5)
+
+    expected = (compute_similarity_sum_part1(memory), compute_similarity_sum_part2(memory))
+    assert (scanner.part1_sum, scanner.part2_sum) == expected, "Resumed scan differs from the regex reference."
+    assert scanner.offset == len(memory), "Offset should cover the whole file after resuming."
+
+def test_resume_rejects_truncated_file(tmp_path):
+    input_file = tmp_path / "input.txt"
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    input_file.write_text(SAMPLE)
+    scanner = MemoryScanner()
+    scanner.resume(str(input_file))
+    scanner.save_checkpoint(checkpoint_file)
+
+    input_file.write_text(SAMPLE[:10])
+    with pytest.raises(ValueError):
+        MemoryScanner.load_checkpoint(checkpoint_file).resume(str(input_file))
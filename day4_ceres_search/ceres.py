@@ -1,6 +1,21 @@
 # day4_ceres_search/ceres_search.py
 
+import mmap
+import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the array engine needs it
+    np = None
+
+DIRECTIONS = [
+    (-1, 0), (1, 0),  # Vertical
+    (0, -1), (0, 1),  # Horizontal
+    (-1, -1), (-1, 1), (1, -1), (1, 1)  # Diagonal
+]
 
 def parse_grid(input_file):
     """
@@ -66,16 +81,11 @@ def count_word_occurrences(grid, word):
         int: Total occurrences of the word in the grid.
     """
     rows, cols = len(grid), len(grid[0])
-    directions = [
-        (-1, 0), (1, 0),  # Vertical
-        (0, -1), (0, 1),  # Horizontal
-        (-1, -1), (-1, 1), (1, -1), (1, 1)  # Diagonal
-    ]
     total_count = 0
 
     for x in range(rows):
         for y in range(cols):
-            for dir_x, dir_y in directions:
+            for dir_x, dir_y in DIRECTIONS:
                 total_count += count_word_in_direction(grid, word, x, y, dir_x, dir_y)
 
     return total_count
@@ -130,29 +140,511 @@ def count_xmas_patterns_part2(grid):
 
     return total_count
 
+def _require_numpy():
+    if np is None:
+        raise ImportError("The array engine requires numpy. Install it with 'pip install numpy'.")
+
+def grid_to_array(grid):
+    """
+    Converts a 2D grid of characters into a 2D uint8 array of byte codes.
+
+    Args:
+        grid (List[List[str]]): 2D grid of characters.
+
+    Returns:
+        np.ndarray: Array of shape (rows, cols) with dtype uint8.
+    """
+    _require_numpy()
+    if not grid:
+        return np.zeros((0, 0), dtype=np.uint8)
+    return np.array([[ord(ch) for ch in row] for row in grid], dtype=np.uint8)
+
+def load_grid_array(input_file):
+    """
+    Loads the input file straight into a 2D uint8 array without per-cell Python objects.
+
+    Args:
+        input_file (str): Path to the input file.
+
+    Returns:
+        np.ndarray: Array of shape (rows, cols) with dtype uint8.
+    """
+    _require_numpy()
+    with open(input_file, 'rb') as file:
+        lines = [line.strip() for line in file if line.strip()]
+    if not lines:
+        return np.zeros((0, 0), dtype=np.uint8)
+    width = len(lines[0])
+    if any(len(line) != width for line in lines):
+        raise ValueError("All grid rows must have the same length.")
+    return np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(len(lines), width)
+
+def _count_word_in_direction_array(grid_array, codes, dir_x, dir_y, start_rows=None):
+    rows, cols = grid_array.shape
+    span_x = (len(codes) - 1) * dir_x
+    span_y = (len(codes) - 1) * dir_y
+    # Range of start cells whose whole word stays inside the grid
+    x_lo, x_hi = max(0, -span_x), rows - max(0, span_x)
+    y_lo, y_hi = max(0, -span_y), cols - max(0, span_y)
+    if start_rows is not None:
+        x_lo, x_hi = max(x_lo, start_rows[0]), min(x_hi, start_rows[1])
+    if x_hi <= x_lo or y_hi <= y_lo:
+        return 0
+    matches = None
+    for i, code in enumerate(codes):
+        shifted = grid_array[x_lo + i * dir_x:x_hi + i * dir_x, y_lo + i * dir_y:y_hi + i * dir_y] == code
+        matches = shifted if matches is None else matches & shifted
+    return int(np.count_nonzero(matches))
+
+def count_word_occurrences_array(grid_array, word):
+    """
+    Counts all occurrences of the word in all 8 directions by AND-ing shifted slices.
+
+    Args:
+        grid_array (np.ndarray): 2D uint8 array from load_grid_array or grid_to_array.
+        word (str): Word to search for.
+
+    Returns:
+        int: Total occurrences of the word in the grid.
+    """
+    _require_numpy()
+    if not word or grid_array.size == 0:
+        return 0
+    codes = word.encode()
+    return sum(_count_word_in_direction_array(grid_array, codes, dir_x, dir_y) for dir_x, dir_y in DIRECTIONS)
+
+def count_xmas_patterns_part2_array(grid_array):
+    """
+    Counts all X-MAS patterns using the four diagonal neighbor slices of every center.
+
+    Args:
+        grid_array (np.ndarray): 2D uint8 array from load_grid_array or grid_to_array.
+
+    Returns:
+        int: Total occurrences of the X-MAS pattern in the grid.
+    """
+    _require_numpy()
+    rows, cols = grid_array.shape
+    if rows < 3 or cols < 3:
+        return 0
+    m, s = ord('M'), ord('S')
+    center = grid_array[1:-1, 1:-1] == ord('A')
+    tl, br = grid_array[:-2, :-2], grid_array[2:, 2:]
+    tr, bl = grid_array[:-2, 2:], grid_array[2:, :-2]
+    diag1 = ((tl == m) & (br == s)) | ((tl == s) & (br == m))
+    diag2 = ((tr == m) & (bl == s)) | ((tr == s) & (bl == m))
+    return int(np.count_nonzero(center & diag1 & diag2))
+
+class WordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed word list.
+
+    Scanning only records how often each state is reached; occurrences are then
+    attributed to words by summing visits up the failure-link tree, so a scan costs
+    time linear in the text length regardless of how many words match.
+    """
+
+    def __init__(self, words):
+        """
+        Builds the automaton.
+
+        Args:
+            words (Iterable[str]): Words to search for. Duplicates are ignored.
+        """
+        self.words = list(dict.fromkeys(words))
+        if any(not word for word in self.words):
+            raise ValueError("Words must be non-empty.")
+        self._goto = [{}]
+        self._fail = [0]
+        self._word_state = []
+        for word in self.words:
+            state = 0
+            for ch in word:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                state = next_state
+            self._word_state.append(state)
+
+        # Breadth-first order lets visit counts be pushed down failure links in reverse
+        self._bfs_order = []
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self._bfs_order.append(state)
+            for ch, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                queue.append(next_state)
+        self._visits = [0] * len(self._goto)
+
+    def feed(self, text):
+        """
+        Streams one line of text through the automaton.
+
+        Args:
+            text (str): The line to scan. Matches never span two lines.
+        """
+        goto, fail, visits = self._goto, self._fail, self._visits
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            visits[state] += 1
+
+    def counts(self):
+        """
+        Returns the number of occurrences of each word in all text fed so far.
+
+        Returns:
+            Dict[str, int]: Occurrence count per word.
+        """
+        totals = list(self._visits)
+        for state in reversed(self._bfs_order):
+            totals[self._fail[state]] += totals[state]
+        return {word: totals[state] for word, state in zip(self.words, self._word_state)}
+
+def iter_grid_lines(grid):
+    """
+    Yields every row, column, diagonal and anti-diagonal of the grid as a string.
+
+    Args:
+        grid (List[List[str]]): 2D grid of characters.
+
+    Yields:
+        str: One grid line, read top-to-bottom and left-to-right.
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    for row in grid:
+        yield "".join(row)
+    for y in range(cols):
+        yield "".join(grid[x][y] for x in range(rows))
+    for d in range(-(rows - 1), cols):
+        # Diagonal cells satisfy y - x == d, anti-diagonal cells satisfy x + y == d + rows - 1
+        yield "".join(grid[x][x + d] for x in range(max(0, -d), min(rows, cols - d)))
+        total = d + rows - 1
+        yield "".join(grid[x][total - x] for x in range(max(0, total - cols + 1), min(rows, total + 1)))
+
+def count_words(grid, words):
+    """
+    Counts every word in all 8 directions in a single pass over the grid lines.
+
+    Each line and its reverse is streamed through one Aho-Corasick automaton, which
+    matches count_word_occurrences for every word.
+
+    Args:
+        grid (List[List[str]]): 2D grid of characters.
+        words (Iterable[str]): Words to search for.
+
+    Returns:
+        Dict[str, int]: Total occurrences of each word in the grid.
+    """
+    automaton = WordAutomaton(words)
+    for line in iter_grid_lines(grid):
+        automaton.feed(line)
+        automaton.feed(line[::-1])
+    return automaton.counts()
+
+def grid_file_layout(input_file):
+    """
+    Determines the shape of a fixed-width grid file without reading it.
+
+    Unlike parse_grid, blank lines are not skipped: a blank line anywhere, including a
+    trailing one after the last row's terminator, makes the rows ragged and raises
+    ValueError.
+
+    Args:
+        input_file (str): Path to the input file. Every row must have the same length.
+
+    Returns:
+        Tuple[int, int, int]: Number of rows, number of columns and bytes per line
+        (including the line terminator).
+    """
+    size = os.path.getsize(input_file)
+    with open(input_file, 'rb') as file:
+        first_line = file.readline()
+    cols = len(first_line.rstrip(b"\r\n"))
+    line_len = len(first_line)
+    if cols == 0:
+        return 0, 0, line_len
+    terminator = line_len - cols
+    if size % line_len == 0:
+        rows = size // line_len
+    elif terminator and (size + terminator) % line_len == 0:
+        rows = (size + terminator) // line_len  # Last row has no line terminator
+    else:
+        raise ValueError("Tiled search requires every grid row to have the same length.")
+    if rows > 1:
+        # A matching size is not enough: every row must end exactly at its expected offset
+        with open(input_file, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            ends = mapped[line_len - 1::line_len]
+            returns = mapped[cols::line_len] if terminator == 2 else b""
+        if ends.count(b"\n") != len(ends) or returns.count(b"\r") != len(returns):
+            raise ValueError("Tiled search requires every grid row to have the same length.")
+    return rows, cols, line_len
+
+def _map_grid_array(input_file, rows, cols, line_len):
+    # Zero-copy (rows, cols) view of the memory-mapped file that skips line terminators
+    mapped = np.memmap(input_file, dtype=np.uint8, mode='r')
+    return np.lib.stride_tricks.as_strided(mapped, shape=(rows, cols), strides=(line_len, 1), writeable=False)
+
+def _count_word_in_tile(input_file, layout, row_start, row_end, word):
+    rows, cols, line_len = layout
+    grid_array = _map_grid_array(input_file, rows, cols, line_len)
+    halo = len(word) - 1
+    band_start = max(0, row_start - halo)
+    band = grid_array[band_start:min(rows, row_end + halo)]
+    # Only matches whose start cell lies in this tile's own rows are counted, so matches
+    # that are also visible from a neighboring tile's halo are never counted twice.
+    own_rows = (row_start - band_start, row_end - band_start)
+    codes = word.encode()
+    return sum(
+        _count_word_in_direction_array(band, codes, dir_x, dir_y, own_rows)
+        for dir_x, dir_y in DIRECTIONS
+    )
+
+def count_word_occurrences_tiled(input_file, word, workers=None, band_rows=None):
+    """
+    Counts a word in all 8 directions across a memory-mapped grid in parallel row bands.
+
+    Each band is extended by a halo of len(word) - 1 rows on both sides so that every
+    match starting in the band is fully visible to its worker. The file must be a
+    fixed-width grid as described in grid_file_layout, so a trailing blank line that
+    parse_grid would accept raises ValueError here.
+
+    Args:
+        input_file (str): Path to a fixed-width grid file.
+        word (str): Word to search for.
+        workers (int, optional): Number of worker processes (defaults to the CPU count).
+        band_rows (int, optional): Rows owned by each tile (defaults to an even split).
+
+    Returns:
+        int: Total occurrences of the word in the grid.
+    """
+    _require_numpy()
+    if not word:
+        return 0
+    layout = grid_file_layout(input_file)
+    rows = layout[0]
+    if rows == 0:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    band_rows = band_rows or -(-rows // workers)
+    starts = list(range(0, rows, band_rows))
+    ends = [min(rows, start + band_rows) for start in starts]
+    with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as executor:
+        counts = executor.map(
+            _count_word_in_tile,
+            [input_file] * len(starts), [layout] * len(starts), starts, ends, [word] * len(starts),
+        )
+        return sum(counts)
+
+# Symmetry transformations for pattern templates, applied to a list of row strings
+_TRANSFORMS = {
+    "identity": lambda rows: rows,
+    "rot90": lambda rows: ["".join(col) for col in zip(*rows[::-1])],
+    "rot180": lambda rows: [row[::-1] for row in rows[::-1]],
+    "rot270": lambda rows: ["".join(col) for col in zip(*rows)][::-1],
+    "flip_h": lambda rows: [row[::-1] for row in rows],
+    "flip_v": lambda rows: rows[::-1],
+    "transpose": lambda rows: ["".join(col) for col in zip(*rows)],
+    "anti_transpose": lambda rows: ["".join(col) for col in zip(*rows[::-1])][::-1],
+}
+ROTATIONS = ("identity", "rot90", "rot180", "rot270")
+ALL_SYMMETRIES = tuple(_TRANSFORMS)
+
+class PatternTemplate:
+    """
+    A 2D pattern with wildcards, compiled into offset/character tables for each of its
+    declared symmetry variants.
+
+    Variants that coincide (for example rotations of a symmetric shape) are only
+    counted once, so a grid position matches a template at most once per distinct variant.
+    """
+
+    def __init__(self, name, rows, symmetries=("identity",), wildcard="."):
+        """
+        Compiles the template.
+
+        Args:
+            name (str): Name used as the key in count results.
+            rows (List[str]): Pattern rows of equal length; wildcard cells match anything.
+            symmetries (Iterable[str]): Transformations from ALL_SYMMETRIES to apply.
+            wildcard (str): Character that matches any grid cell.
+        """
+        if not rows or not rows[0] or any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("Template rows must be non-empty and of equal length.")
+        unknown = set(symmetries) - set(_TRANSFORMS)
+        if unknown:
+            raise ValueError(f"Unknown symmetries: {sorted(unknown)}")
+        self.name = name
+        self.variants = []
+        seen = set()
+        for symmetry in symmetries:
+            variant = tuple(_TRANSFORMS[symmetry](list(rows)))
+            if variant in seen:
+                continue
+            seen.add(variant)
+            cells = tuple(
+                (dx, dy, ch)
+                for dx, row in enumerate(variant)
+                for dy, ch in enumerate(row)
+                if ch != wildcard
+            )
+            # Each variant is (height, width, ((row offset, col offset, char), ...))
+            self.variants.append((len(variant), len(variant[0]), cells))
+
+XMAS_TEMPLATE = PatternTemplate("X-MAS", ["M.S", ".A.", "M.S"], symmetries=ROTATIONS)
+
+def count_templates(grid, templates):
+    """
+    Counts every template over the grid in one sweep using per-character row bitsets.
+
+    Bit y of row_masks[ch][x] is set when grid[x][y] == ch, so a variant matches at all
+    top-left cells set in the AND of its rows' masks shifted by the column offsets.
+
+    Args:
+        grid (List[List[str]]): 2D grid of characters.
+        templates (Iterable[PatternTemplate]): Templates to count.
+
+    Returns:
+        Dict[str, int]: Total matches of each template, keyed by template name.
+    """
+    templates = list(templates)
+    totals = {template.name: 0 for template in templates}
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    row_masks = {}
+    for x, row in enumerate(grid):
+        for y, ch in enumerate(row):
+            masks = row_masks.get(ch)
+            if masks is None:
+                masks = row_masks[ch] = [0] * rows
+            masks[x] |= 1 << y
+    empty = [0] * rows
+
+    for x in range(rows):
+        for template in templates:
+            for height, width, cells in template.variants:
+                if x + height > rows or width > cols:
+                    continue
+                matches = (1 << (cols - width + 1)) - 1
+                for dx, dy, ch in cells:
+                    matches &= row_masks.get(ch, empty)[x + dx] >> dy
+                    if not matches:
+                        break
+                totals[template.name] += matches.bit_count()
+    return totals
+
+def _is_xmas_center(grid, x, y, rows, cols):
+    if not (1 <= x < rows - 1 and 1 <= y < cols - 1) or grid[x][y] != 'A':
+        return False
+    diag1 = {grid[x - 1][y - 1], grid[x + 1][y + 1]}
+    diag2 = {grid[x - 1][y + 1], grid[x + 1][y - 1]}
+    return diag1 == {'M', 'S'} and diag2 == {'M', 'S'}
+
+class GridCounter:
+    """
+    Keeps the word count and the X-MAS count of a grid up to date under single-cell edits.
+
+    An edit can only change the word windows that pass through the edited cell and the
+    X-MAS centers at the cell or its four diagonal neighbors, so only those are recounted
+    before and after the edit. The windows are read from the 2 * len(word) - 1 cells
+    around the edit on each of the 8 directions, so an edit costs O(len(word) ** 2)
+    character comparisons, independent of the grid size.
+    """
+
+    def __init__(self, grid, word="XMAS"):
+        """
+        Counts the initial grid.
+
+        Args:
+            grid (List[List[str]]): 2D grid of characters. It is copied, not shared.
+            word (str): Word counted in all 8 directions.
+        """
+        self.grid = [list(row) for row in grid]
+        self.word = word
+        self.rows = len(self.grid)
+        self.cols = len(self.grid[0]) if self.rows else 0
+        self.word_count = count_word_occurrences(self.grid, word) if self.rows else 0
+        self.xmas_count = count_xmas_patterns_part2(self.grid) if self.rows else 0
+
+    def _count_windows_through(self, x, y):
+        word, length = self.word, len(self.word)
+        total = 0
+        for dir_x, dir_y in DIRECTIONS:
+            # Every window of the word inside this segment passes through (x, y)
+            segment = "".join(
+                self.grid[x + i * dir_x][y + i * dir_y]
+                for i in range(1 - length, length)
+                if is_valid_position(x + i * dir_x, y + i * dir_y, self.rows, self.cols)
+            )
+            total += sum(segment.startswith(word, start) for start in range(len(segment) - length + 1))
+        return total
+
+    def _count_centers_near(self, x, y):
+        return sum(
+            _is_xmas_center(self.grid, x + dx, y + dy, self.rows, self.cols)
+            for dx, dy in ((0, 0), (-1, -1), (-1, 1), (1, -1), (1, 1))
+        )
+
+    def set_cell(self, x, y, ch):
+        """
+        Changes one cell and updates both counts.
+
+        Args:
+            x (int): Row index.
+            y (int): Column index.
+            ch (str): New single character for the cell.
+        """
+        if not is_valid_position(x, y, self.rows, self.cols):
+            raise ValueError(f"Position ({x}, {y}) is outside the grid.")
+        if len(ch) != 1:
+            raise ValueError("A cell must hold exactly one character.")
+        if self.grid[x][y] == ch:
+            return
+        old_words = self._count_windows_through(x, y)
+        old_centers = self._count_centers_near(x, y)
+        self.grid[x][y] = ch
+        self.word_count += self._count_windows_through(x, y) - old_words
+        self.xmas_count += self._count_centers_near(x, y) - old_centers
+
 def main():
     """
     Main function to count occurrences of either the word XMAS (Part One) or the X-MAS pattern (Part Two).
 
     Usage:
-        python ceres_search.py <input_file> [--part1|--part2]
+        python ceres_search.py <input_file> [--part1|--part2] [--numpy]
     """
-    if len(sys.argv) != 3:
-        print("Usage: python ceres_search.py <input_file> [--part1|--part2]")
+    if len(sys.argv) not in (3, 4) or (len(sys.argv) == 4 and sys.argv[3] != "--numpy"):
+        print("Usage: python ceres_search.py <input_file> [--part1|--part2] [--numpy]")
         sys.exit(1)
 
     input_file = sys.argv[1]
     part = sys.argv[2]
+    use_numpy = len(sys.argv) == 4
 
     try:
-        grid = parse_grid(input_file)
+        if use_numpy:
+            grid = load_grid_array(input_file)
+            count_word, count_xmas = count_word_occurrences_array, count_xmas_patterns_part2_array
+        else:
+            grid = parse_grid(input_file)
+            count_word, count_xmas = count_word_occurrences, count_xmas_patterns_part2
 
         if part == "--part1":
             word = "XMAS"
-            occurrences = count_word_occurrences(grid, word)
+            occurrences = count_word(grid, word)
             print(f"Total occurrences of '{word}': {occurrences}")
         elif part == "--part2":
-            occurrences = count_xmas_patterns_part2(grid)
+            occurrences = count_xmas(grid)
             print(f"Total occurrences of X-MAS pattern: {occurrences}")
         else:
             print("Invalid option. Use --part1 or --part2.")
@@ -0,0 +1,308 @@
+# day4_ceres_search/tests/test_ceres.py
+
+import random
+import pytest
+from day4_ceres_search.ceres import (
+    parse_grid,
+    count_word_occurrences,
+    count_xmas_patterns_part2,
+    grid_to_array,
+    load_grid_array,
+    count_word_occurrences_array,
+    count_xmas_patterns_part2_array,
+    WordAutomaton,
+    iter_grid_lines,
+    count_words,
+    grid_file_layout,
+    _TRANSFORMS,
+    ROTATIONS,
+    ALL_SYMMETRIES,
+    PatternTemplate,
+    XMAS_TEMPLATE,
+    count_templates,
+    count_word_occurrences_tiled,
+    GridCounter
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
+EXAMPLE_GRID = [
+    "MMMSXXMASM",
+    "MSAMXMSMSA",
+    "AMXSXMAAMM",
+    "MSAMASMSMX",
+    "XMASAMXAMM",
+    "XXAMMXXAMA",
+    "SMSMSASXSS",
+    "SAXAMASAAA",
+    "MAMMMXMMMM",
+    "MXMXAXMASX",
+]
+
+def _random_grid(rng, rows, cols, alphabet="XMAS"):
+    return [[rng.choice(alphabet) for _ in range(cols)] for _ in range(rows)]
+
+def _count_template_brute_force(grid, template):
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    return sum(
+        all(grid[x + dx][y + dy] == ch for dx, dy, ch in cells)
+        for height, width, cells in template.variants
+        for x in range(rows - height + 1)
+        for y in range(cols - width + 1)
+    )
+
+def _write_grid(tmp_path, rows, newline="\n", final_newline=True):
+    input_file = tmp_path / "grid.txt"
+    text = newline.join(rows) + (newline if final_newline else "")
+    input_file.write_bytes(text.encode())
+    return str(input_file)
+
+# Fixtures for common input data
+@pytest.fixture
+def example_grid():
+    return [list(row) for row in EXAMPLE_GRID]
+
+# Tests for the reference counters
+def test_count_word_occurrences(example_grid):
+    assert count_word_occurrences(example_grid, "XMAS") == 18, "XMAS count of the example is incorrect."
+
+def test_count_xmas_patterns_part2(example_grid):
+    assert count_xmas_patterns_part2(example_grid) == 9, "X-MAS count of the example is incorrect."
+
+# Tests for the numpy array engine
+@requires_numpy
+def test_array_engine_example(example_grid):
+    grid_array = grid_to_array(example_grid)
+    assert count_word_occurrences_array(grid_array, "XMAS") == 18, "Array XMAS count of the example is incorrect."
+    assert count_xmas_patterns_part2_array(grid_array) == 9, "Array X-MAS count of the example is incorrect."
+
+@requires_numpy
+def test_array_engine_matches_reference():
+    rng = random.Random(13)
+    for rows, cols in [(1, 1), (1, 6), (5, 1), (2, 2), (3, 3), (4, 9), (11, 7)]:
+        for _ in range(10):
+            grid = _random_grid(rng, rows, cols)
+            grid_array = grid_to_array(grid)
+            for word in ("XMAS", "SAS", "AA", "X", "XMASXMASXMAS"):
+                assert count_word_occurrences_array(grid_array, word) == count_word_occurrences(grid, word), \
+                    f"Array count of {word} differs from the reference on a {rows}x{cols} grid."
+            assert count_xmas_patterns_part2_array(grid_array) == count_xmas_patterns_part2(grid), \
+                f"Array X-MAS count differs from the reference on a {rows}x{cols} grid."
+
+@requires_numpy
+def test_array_engine_empty_inputs(example_grid):
+    assert count_word_occurrences_array(grid_to_array(example_grid), "") == 0, "An empty word should not match."
+    assert count_word_occurrences_array(grid_to_array([]), "XMAS") == 0, "An empty grid should have no matches."
+    assert count_xmas_patterns_part2_array(grid_to_array([])) == 0, "An empty grid should have no X-MAS."
+
+@requires_numpy
+def test_load_grid_array(tmp_path):
+    input_file = _write_grid(tmp_path, EXAMPLE_GRID + [""], "\r\n")
+    grid_array = load_grid_array(input_file)
+    assert grid_array.shape == (10, 10), "Loaded array shape is incorrect."
+    assert (grid_array == grid_to_array(parse_grid(input_file))).all(), "Loaded array differs from parse_grid."
+    ragged_file = tmp_path / "ragged.txt"
+    ragged_file.write_text("XMAS\nXM\n")
+    with pytest.raises(ValueError):
+        load_grid_array(str(ragged_file))
+
+# Tests for the Aho-Corasick multi-word search
+def test_word_automaton_overlapping_matches():
+    automaton = WordAutomaton(["AA", "A", "AAA", "BAB", "AB"])
+    automaton.feed("AAAA")
+    automaton.feed("BABAB")
+    assert automaton.counts() == {"AA": 3, "A": 6, "AAA": 2, "BAB": 2, "AB": 2}, \
+        "Overlapping and nested matches are counted incorrectly."
+
+def test_word_automaton_matches_do_not_span_lines():
+    automaton = WordAutomaton(["XMAS"])
+    automaton.feed("XM")
+    automaton.feed("AS")
+    assert automaton.counts() == {"XMAS": 0}, "A match should not span two fed lines."
+
+def test_word_automaton_duplicates_and_empty_words():
+    automaton = WordAutomaton(["XMAS", "XMAS", "MAS"])
+    assert automaton.words == ["XMAS", "MAS"], "Duplicate words should be dropped in order."
+    with pytest.raises(ValueError):
+        WordAutomaton(["XMAS", ""])
+
+def test_iter_grid_lines_covers_each_cell_four_times():
+    grid = [[chr(ord('a') + x * 4 + y) for y in range(4)] for x in range(3)]
+    lines = list(iter_grid_lines(grid))
+    assert lines[:3] == ["abcd", "efgh", "ijkl"], "Rows are yielded incorrectly."
+    assert lines[3:7] == ["aei", "bfj", "cgk", "dhl"], "Columns are yielded incorrectly."
+    assert set(lines[7::2]) == {"i", "ej", "afk", "bgl", "ch", "d"}, "Diagonals are yielded incorrectly."
+    assert set(lines[8::2]) == {"a", "be", "cfi", "dgj", "hk", "l"}, "Anti-diagonals are yielded incorrectly."
+    text = "".join(lines)
+    assert all(text.count(ch) == 4 for row in grid for ch in row), "Every cell should appear on four grid lines."
+
+def test_count_words_example(example_grid):
+    assert count_words(example_grid, ["XMAS"]) == {"XMAS": 18}, "XMAS count of the example is incorrect."
+
+@pytest.mark.parametrize("words", [
+    ["XMAS", "SAMX"],              # Reversed pair
+    ["SAS", "MAM", "AXA"],         # Palindromes
+    ["X", "M", "A", "S"],          # Single characters
+    ["XMAS", "MAS", "AS", "S"],    # Suffixes of each other
+    ["XM", "XMA", "XMAS"],         # Prefixes of each other
+    ["AA", "AAA", "MAMA"],         # Self-overlapping words
+])
+def test_count_words_matches_reference(words):
+    rng = random.Random(14)
+    for rows, cols in [(1, 1), (1, 8), (6, 1), (4, 4), (7, 11), (12, 5)]:
+        grid = _random_grid(rng, rows, cols)
+        expected = {word: count_word_occurrences(grid, word) for word in words}
+        assert count_words(grid, words) == expected, f"Multi-word counts differ from the reference on {grid}."
+
+# Tests for the pattern templates
+@pytest.mark.parametrize("symmetry, expected", [
+    ("identity", ["ab", "cd", "ef"]),
+    ("rot90", ["eca", "fdb"]),
+    ("rot180", ["fe", "dc", "ba"]),
+    ("rot270", ["bdf", "ace"]),
+    ("flip_h", ["ba", "dc", "fe"]),
+    ("flip_v", ["ef", "cd", "ab"]),
+    ("transpose", ["ace", "bdf"]),
+    ("anti_transpose", ["fdb", "eca"]),
+])
+def test_transforms_on_non_square_template(symmetry, expected):
+    assert _TRANSFORMS[symmetry](["ab", "cd", "ef"]) == expected, f"The {symmetry} transform is incorrect."
+
+def test_transforms_compose_as_rotations():
+    rows = ["abc", "def"]
+    rot90 = _TRANSFORMS["rot90"]
+    assert rot90(rot90(rows)) == _TRANSFORMS["rot180"](rows), "Two quarter turns should give rot180."
+    assert rot90(rot90(rot90(rows))) == _TRANSFORMS["rot270"](rows), "Three quarter turns should give rot270."
+    assert rot90(rot90(rot90(rot90(rows)))) == rows, "Four quarter turns should give the identity."
+    assert rot90(_TRANSFORMS["flip_v"](rows)) == _TRANSFORMS["transpose"](rows), \
+        "A vertical flip followed by a quarter turn should give the transpose."
+    assert len({tuple(transform(rows)) for transform in _TRANSFORMS.values()}) == 8, \
+        "An asymmetric template should have eight distinct variants."
+
+def test_pattern_template_deduplicates_variants():
+    assert len(XMAS_TEMPLATE.variants) == 4, "The X-MAS template has four distinct rotations."
+    assert len(PatternTemplate("plus", [".A.", "AAA", ".A."], ALL_SYMMETRIES).variants) == 1, \
+        "A fully symmetric template should have one variant."
+    assert len(PatternTemplate("bar", ["XMAS"], ROTATIONS).variants) == 4, "A bar has four distinct rotations."
+
+@pytest.mark.parametrize("rows, symmetries", [
+    ([], ROTATIONS),
+    (["XM", "X"], ROTATIONS),
+    (["XM"], ("identity", "mirror")),
+])
+def test_pattern_template_rejects_invalid_definitions(rows, symmetries):
+    with pytest.raises(ValueError):
+        PatternTemplate("bad", rows, symmetries)
+
+def test_count_templates_example(example_grid):
+    assert count_templates(example_grid, [XMAS_TEMPLATE]) == {"X-MAS": 9}, "X-MAS count of the example is incorrect."
+    xmas_bar = PatternTemplate("XMAS", ["XMAS"], ALL_SYMMETRIES)
+    xmas_diagonal = PatternTemplate("XMAS diagonal", ["X...", ".M..", "..A.", "...S"], ALL_SYMMETRIES)
+    counts = count_templates(example_grid, [xmas_bar, xmas_diagonal])
+    assert counts["XMAS"] + counts["XMAS diagonal"] == 18, "Straight and diagonal XMAS templates should add up to 18."
+
+def test_count_templates_matches_reference():
+    rng = random.Random(16)
+    templates = [
+        XMAS_TEMPLATE,
+        PatternTemplate("corner", ["XM", "A."], ALL_SYMMETRIES),
+        PatternTemplate("tall", ["X", ".", "S"], ("identity", "rot90")),
+        PatternTemplate("single", ["A"], ALL_SYMMETRIES),
+    ]
+    for rows, cols in [(1, 1), (2, 5), (5, 2), (3, 3), (8, 13)]:
+        for _ in range(10):
+            grid = _random_grid(rng, rows, cols)
+            counts = count_templates(grid, templates)
+            assert counts["X-MAS"] == count_xmas_patterns_part2(grid), "X-MAS count differs from the reference."
+            for template in templates:
+                assert counts[template.name] == _count_template_brute_force(grid, template), \
+                    f"Count of template {template.name} differs from brute force on a {rows}x{cols} grid."
+
+# Tests for the fixed-width file layout
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("final_newline", [True, False])
+def test_grid_file_layout(tmp_path, newline, final_newline):
+    input_file = _write_grid(tmp_path, EXAMPLE_GRID, newline, final_newline)
+    assert grid_file_layout(input_file) == (10, 10, 10 + len(newline)), "Layout of the example is incorrect."
+
+@pytest.mark.parametrize("text", [
+    "XMA\nSXMASXM\n",          # Size is a multiple of the first line's length
+    "XMAS\nXM\nXMASXM\n",
+    "XMAS\r\nSAMX\n\nX\r\n",    # CRLF row followed by LF rows
+    "XMAS\nSAMX\n\n",           # Trailing blank line
+    "XMAS\n\nSAMX\n",           # Blank line between rows
+])
+def test_grid_file_layout_rejects_ragged_rows(tmp_path, text):
+    input_file = tmp_path / "grid.txt"
+    input_file.write_bytes(text.encode())
+    with pytest.raises(ValueError):
+        grid_file_layout(str(input_file))
+
+def test_grid_file_layout_single_row_and_empty(tmp_path):
+    assert grid_file_layout(_write_grid(tmp_path, ["XMAS"], final_newline=False)) == (1, 4, 4), \
+        "Layout of a single unterminated row is incorrect."
+    assert grid_file_layout(_write_grid(tmp_path, [], final_newline=False)) == (0, 0, 0), \
+        "Layout of an empty file is incorrect."
+
+# Tests for the tiled parallel search
+@requires_numpy
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("final_newline", [True, False])
+def test_count_word_occurrences_tiled(tmp_path, newline, final_newline):
+    input_file = _write_grid(tmp_path, EXAMPLE_GRID, newline, final_newline)
+    for band_rows in (1, 2, 3, 25, None):
+        assert count_word_occurrences_tiled(input_file, "XMAS", workers=2, band_rows=band_rows) == 18, \
+            f"Tiled XMAS count with band_rows={band_rows} is incorrect."
+
+@requires_numpy
+def test_count_word_occurrences_tiled_random_grids(tmp_path):
+    rng = random.Random(15)
+    for rows, cols in [(1, 9), (7, 5), (12, 12)]:
+        grid_rows = ["".join(row) for row in _random_grid(rng, rows, cols)]
+        input_file = _write_grid(tmp_path, grid_rows)
+        for word in ("XMAS", "SAS", "X"):
+            expected = count_word_occurrences(parse_grid(input_file), word)
+            for band_rows in (1, 2, rows + 1):
+                assert count_word_occurrences_tiled(input_file, word, workers=2, band_rows=band_rows) == expected, \
+                    f"Tiled count of {word} with band_rows={band_rows} on a {rows}x{cols} grid is incorrect."
+
+@requires_numpy
+def test_count_word_occurrences_tiled_rejects_ragged_rows(tmp_path):
+    input_file = tmp_path / "grid.txt"
+    input_file.write_text("XMA\nSXMASXM\n")
+    with pytest.raises(ValueError):
+        count_word_occurrences_tiled(str(input_file), "XMAS", workers=2)
+
+# Tests for incremental recounts
+def test_grid_counter_example(example_grid):
+    counter = GridCounter(example_grid)
+    assert (counter.word_count, counter.xmas_count) == (18, 9), "Initial counts of the example are incorrect."
+    counter.set_cell(0, 0, 'X')
+    assert counter.grid[0][0] == 'X' and example_grid[0][0] == 'M', "The counter should edit its own copy."
+
+@pytest.mark.parametrize("word", ["XMAS", "SAS", "AA", "X"])
+def test_grid_counter_random_edits(word):
+    rng = random.Random(17)
+    for rows, cols in [(1, 1), (1, 7), (6, 1), (5, 8), (9, 9)]:
+        counter = GridCounter(_random_grid(rng, rows, cols), word)
+        for _ in range(150):
+            counter.set_cell(rng.randrange(rows), rng.randrange(cols), rng.choice("XMAS"))
+            assert counter.word_count == count_word_occurrences(counter.grid, word), \
+                f"Word count of {word} after an edit differs from a full recount."
+            assert counter.xmas_count == count_xmas_patterns_part2(counter.grid), \
+                "X-MAS count after an edit differs from a full recount."
+
+def test_grid_counter_invalid_edits(example_grid):
+    counter = GridCounter(example_grid)
+    with pytest.raises(ValueError):
+        counter.set_cell(10, 0, 'X')
+    with pytest.raises(ValueError):
+        counter.set_cell(0, -1, 'X')
+    with pytest.raises(ValueError):
+        counter.set_cell(0, 0, 'XM')
@@ -1,7 +1,9 @@
 # day5_print_queue/print_queue.py
 
+import os
 import sys
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 
 def parse_input(input_file):
     """
@@ -96,6 +98,305 @@ def find_middle_page(update):
     """
     return update[len(update) // 2]
 
+class RuleIndex:
+    """
+    Precedence rules compiled into per-page lookup sets.
+
+    For every page, must_follow holds the pages that rule X|Y requires to come after it
+    and must_precede holds the pages required to come before it, so checking an update
+    never touches rules whose pages are not in it. rule_ranks records the order in
+    which the rules were added, which reorder uses to break ties the way
+    reorder_update does.
+    """
+
+    def __init__(self, rules=()):
+        """
+        Compiles the rules.
+
+        Args:
+            rules (Iterable[Tuple[int, int]]): Precedence rules as (X, Y) tuples.
+        """
+        self.must_follow = defaultdict(set)
+        self.must_precede = defaultdict(set)
+        self.rule_ranks = {}
+        self._next_rank = 0
+        for x, y in rules:
+            self.add_rule(x, y)
+
+    def add_rule(self, x, y):
+        """
+        Adds the rule that page x must be printed before page y.
+        """
+        if (x, y) not in self.rule_ranks:
+            self.rule_ranks[(x, y)] = self._next_rank
+            self._next_rank += 1
+        self.must_follow[x].add(y)
+        self.must_precede[y].add(x)
+
+    def remove_rule(self, x, y):
+        """
+        Removes the rule that page x must be printed before page y, if present.
+        """
+        self.rule_ranks.pop((x, y), None)
+        self.must_follow[x].discard(y)
+        self.must_precede[y].discard(x)
+
+    def is_valid(self, update):
+        """
+        Checks an update in O(k) set lookups, independent of the total number of rules.
+
+        Args:
+            update (List[int]): The list of page numbers in the update.
+
+        Returns:
+            bool: True if no page appears after a page that must follow it.
+        """
+        seen = set()
+        for page in update:
+            following = self.must_follow.get(page)
+            if following and not following.isdisjoint(seen):
+                return False
+            seen.add(page)
+        return True
+
+    def partition(self, updates):
+        """
+        Splits updates into valid and invalid ones, preserving their order.
+
+        Args:
+            updates (Iterable[List[int]]): The updates to check.
+
+        Returns:
+            Tuple[List[List[int]], List[List[int]]]: The valid and the invalid updates.
+        """
+        valid, invalid = [], []
+        for update in updates:
+            (valid if self.is_valid(update) else invalid).append(update)
+        return valid, invalid
+
+    def reorder(self, update):
+        """
+        Reorders an update with Kahn's algorithm over the subgraph induced by its pages.
+
+        Successors are visited in the order their rules were added, so when the rules
+        leave some pages unordered the result is the same as reorder_update with the
+        rules in that order (for a rule list without duplicates).
+
+        Args:
+            update (List[int]): The list of page numbers in the update.
+
+        Returns:
+            List[int]: The reordered update.
+        """
+        pages = set(update)
+        successors = {}
+        indegree = {}
+        for page in update:
+            following = self.must_follow.get(page, ())
+            successors[page] = sorted((other for other in update if other in following),
+                                      key=lambda other: self.rule_ranks[(page, other)])
+            indegree[page] = len(pages & self.must_precede.get(page, set()))
+
+        queue = deque([page for page in update if indegree[page] == 0])
+        sorted_update = []
+        while queue:
+            current = queue.popleft()
+            sorted_update.append(current)
+            for neighbor in successors[current]:
+                indegree[neighbor] -= 1
+                if indegree[neighbor] == 0:
+                    queue.append(neighbor)
+        return sorted_update
+
+    def middle_page(self, update):
+        """
+        Finds the middle page of the reordered update without sorting it.
+
+        When the rules order every pair of pages in the update, the page at sorted
+        position len(update) // 2 is the one with exactly that many predecessors in the
+        update. Otherwise this falls back to a full reorder.
+
+        Args:
+            update (List[int]): The list of page numbers in the update.
+
+        Returns:
+            int: The middle page number of the reordered update.
+        """
+        pages = set(update)
+        middle = len(update) // 2
+        pairs = len(update) * (len(update) - 1) // 2
+        ordered_pairs = 0
+        candidate = None
+        for page in update:
+            predecessors = len(pages & self.must_precede.get(page, set()))
+            ordered_pairs += predecessors
+            if predecessors == middle:
+                candidate = page
+        if candidate is not None and ordered_pairs == pairs:
+            return candidate
+        return find_middle_page(self.reorder(update))
+
+class UpdateIndex:
+    """
+    Keeps both middle-page sums current while precedence rules change.
+
+    Each page maps to the updates containing it, and every update caches its validity
+    and its middle page (the reordered middle page for invalid updates). A rule X|Y can
+    only affect updates containing both X and Y, so only those are re-evaluated.
+
+    Attributes:
+        valid_middle_sum (int): Sum of middle pages of the valid updates.
+        reordered_middle_sum (int): Sum of middle pages of the reordered invalid updates.
+    """
+
+    def __init__(self, rules, updates):
+        """
+        Indexes the updates and evaluates each one once.
+
+        Args:
+            rules (Iterable[Tuple[int, int]]): Precedence rules as (X, Y) tuples.
+            updates (Iterable[List[int]]): The updates to track.
+        """
+        self.rule_index = RuleIndex(rules)
+        self.updates = [list(update) for update in updates]
+        self.updates_by_page = defaultdict(set)
+        for update_id, update in enumerate(self.updates):
+            for page in update:
+                self.updates_by_page[page].add(update_id)
+        self.valid = [False] * len(self.updates)
+        self.middle_pages = [0] * len(self.updates)
+        self.valid_middle_sum = 0
+        self.reordered_middle_sum = 0
+        self._refresh(range(len(self.updates)))
+
+    def _refresh(self, update_ids):
+        for update_id in update_ids:
+            if self.valid[update_id]:
+                self.valid_middle_sum -= self.middle_pages[update_id]
+            else:
+                self.reordered_middle_sum -= self.middle_pages[update_id]
+
+            update = self.updates[update_id]
+            if self.rule_index.is_valid(update):
+                self.valid[update_id] = True
+                self.middle_pages[update_id] = find_middle_page(update)
+                self.valid_middle_sum += self.middle_pages[update_id]
+            else:
+                self.valid[update_id] = False
+                self.middle_pages[update_id] = self.rule_index.middle_page(update)
+                self.reordered_middle_sum += self.middle_pages[update_id]
+
+    def _affected(self, x, y):
+        return self.updates_by_page.get(x, set()) & self.updates_by_page.get(y, set())
+
+    def add_rule(self, x, y):
+        """
+        Adds the rule X|Y and re-evaluates only the updates containing both pages.
+        """
+        if y in self.rule_index.must_follow.get(x, ()):
+            return
+        self.rule_index.add_rule(x, y)
+        self._refresh(self._affected(x, y))
+
+    def remove_rule(self, x, y):
+        """
+        Removes the rule X|Y and re-evaluates only the updates containing both pages.
+        """
+        if y not in self.rule_index.must_follow.get(x, ()):
+            return
+        self.rule_index.remove_rule(x, y)
+        self._refresh(self._affected(x, y))
+
+class BitsetRuleIndex:
+    """
+    Precedence rules encoded as bitsets over page numbers.
+
+    after_masks[X] has bit Y set for every rule X|Y, so an update is valid exactly when
+    no page's mask intersects the running OR of the pages printed before it.
+    """
+
+    def __init__(self, rules=(), after_masks=None):
+        """
+        Compiles the rules into masks.
+
+        Args:
+            rules (Iterable[Tuple[int, int]]): Precedence rules as (X, Y) tuples.
+            after_masks (Dict[int, int], optional): Already compiled masks to reuse.
+        """
+        self.after_masks = dict(after_masks) if after_masks else {}
+        for x, y in rules:
+            self.after_masks[x] = self.after_masks.get(x, 0) | (1 << y)
+
+    def is_valid(self, update):
+        """
+        Checks an update with one AND and one OR per page.
+
+        Args:
+            update (List[int]): The list of page numbers in the update.
+
+        Returns:
+            bool: True if the update is valid, False otherwise.
+        """
+        after_masks = self.after_masks
+        seen = 0
+        for page in update:
+            if after_masks.get(page, 0) & seen:
+                return False
+            seen |= 1 << page
+        return True
+
+    def partition(self, updates):
+        """
+        Splits updates into valid and invalid ones, preserving their order.
+
+        Args:
+            updates (Iterable[List[int]]): The updates to check.
+
+        Returns:
+            Tuple[List[List[int]], List[List[int]]]: The valid and the invalid updates.
+        """
+        valid, invalid = [], []
+        for update in updates:
+            (valid if self.is_valid(update) else invalid).append(update)
+        return valid, invalid
+
+_worker_rule_index = None
+
+def _init_bitset_worker(after_masks):
+    global _worker_rule_index
+    _worker_rule_index = BitsetRuleIndex(after_masks=after_masks)
+
+def _validate_shard(updates):
+    return [_worker_rule_index.is_valid(update) for update in updates]
+
+def validate_updates_parallel(rules, updates, workers=None, shard_size=10000):
+    """
+    Validates updates in shards on a process pool.
+
+    The compiled masks are shipped to each worker once through the pool initializer;
+    afterwards only the update shards and their results cross process boundaries.
+
+    Args:
+        rules (Iterable[Tuple[int, int]]): Precedence rules as (X, Y) tuples.
+        updates (List[List[int]]): The updates to check.
+        workers (int, optional): Number of worker processes (defaults to the CPU count).
+        shard_size (int): Number of updates sent to a worker per task.
+
+    Returns:
+        List[bool]: Validity of each update, in input order.
+    """
+    rule_index = BitsetRuleIndex(rules)
+    shards = [updates[i:i + shard_size] for i in range(0, len(updates), shard_size)]
+    if not shards:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_bitset_worker,
+                             initargs=(rule_index.after_masks,)) as executor:
+        results = []
+        for shard_result in executor.map(_validate_shard, shards):
+            results.extend(shard_result)
+        return results
+
 def process_incorrect_updates(input_file):
     """
     Processes the print queue to find the sum of the middle page numbers for reordered incorrect updates.
@@ -107,35 +408,81 @@ def process_incorrect_updates(input_file):
         int: The sum of the middle page numbers for reordered incorrect updates.
     """
     rules, updates = parse_input(input_file)
-    incorrect_updates = []
+    rule_index = RuleIndex(rules)
+    _, incorrect_updates = rule_index.partition(updates)
 
-    for update in updates:
-        if not is_update_valid(update, rules):
-            incorrect_updates.append(update)
-
-    # Reorder each incorrect update and calculate the sum of middle pages
-    reordered_middle_sum = sum(
-        find_middle_page(reorder_update(update, rules)) for update in incorrect_updates
-    )
+    # Find the middle page each incorrect update would have once reordered
+    reordered_middle_sum = sum(rule_index.middle_page(update) for update in incorrect_updates)
 
     return reordered_middle_sum
 
+def solve_print_queue(input_file):
+    """
+    Solves both parts in one streaming pass over the input file.
+
+    The rules section is compiled into a RuleIndex first; the updates section is then
+    read line by line, and each update is validated once and routed either to the valid
+    middle-page sum (Part 1) or to the reordered middle-page sum (Part 2). Only one
+    update is held in memory at a time.
+
+    Args:
+        input_file (str): Path to the input file.
+
+    Returns:
+        Tuple[int, int]: The sum of middle pages of valid updates and the sum of
+        middle pages of reordered incorrect updates.
+    """
+    rule_index = RuleIndex()
+    valid_middle_sum = 0
+    reordered_middle_sum = 0
+
+    with open(input_file, 'r') as file:
+        rules_seen = False
+        for line in file:
+            line = line.strip()
+            if not line:
+                if rules_seen:
+                    break  # Blank line separating the rules from the updates
+                continue
+            x, y = map(int, line.split('|'))
+            rule_index.add_rule(x, y)
+            rules_seen = True
+
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            update = list(map(int, line.split(',')))
+            if rule_index.is_valid(update):
+                valid_middle_sum += find_middle_page(update)
+            else:
+                reordered_middle_sum += rule_index.middle_page(update)
+
+    return valid_middle_sum, reordered_middle_sum
+
 def main():
     """
-    Main function to process the print queue for part 2.
+    Main function to process the print queue.
 
     Usage:
-        python print_queue.py <input_file> --part2
+        python print_queue.py <input_file> [--part1|--part2|--both]
     """
-    if len(sys.argv) != 3 or sys.argv[2] != "--part2":
-        print("Usage: python print_queue.py <input_file> --part2")
+    if len(sys.argv) != 3 or sys.argv[2] not in ("--part1", "--part2", "--both"):
+        print("Usage: python print_queue.py <input_file> [--part1|--part2|--both]")
         sys.exit(1)
 
     input_file = sys.argv[1]
+    part = sys.argv[2]
 
     try:
-        result = process_incorrect_updates(input_file)
-        print(f"Sum of middle page numbers for reordered incorrect updates: {result}")
+        if part == "--part2":
+            result = process_incorrect_updates(input_file)
+            print(f"Sum of middle page numbers for reordered incorrect updates: {result}")
+        else:
+            valid_middle_sum, reordered_middle_sum = solve_print_queue(input_file)
+            print(f"Sum of middle page numbers for correctly ordered updates: {valid_middle_sum}")
+            if part == "--both":
+                print(f"Sum of middle page numbers for reordered incorrect updates: {reordered_middle_sum}")
     except FileNotFoundError:
         print(f"Error: The file '{input_file}' was not found.")
         sys.exit(1)
@@ -144,4 +491,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,265 @@
+# day5_print_queue/tests/test_print_queue.py
+
+import random
+import pytest
+from day5_print_queue.print_queue import (
+    parse_input,
+    is_update_valid,
+    reorder_update,
+    find_middle_page,
+    RuleIndex,
+    UpdateIndex,
+    BitsetRuleIndex,
+    validate_updates_parallel,
+    process_incorrect_updates,
+    solve_print_queue
+)
+
+EXAMPLE_INPUT = """47|53
+97|13
+97|61
+97|47
+75|29
+61|13
+75|53
+29|13
+97|29
+53|29
+61|53
+97|53
+61|29
+47|13
+75|47
+97|75
+47|61
+75|61
+47|29
+75|13
+53|13
+
+75,47,61,53,29
+97,61,53,29,13
+75,29,13
+75,97,47,61,53
+61,13,29
+97,13,75,29,47
+"""
+
+def _random_rules_and_updates(count, seed=19):
+    # Acyclic rules over a random page ranking; each rule is kept with probability 1/2,
+    # so most updates are only partially ordered
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        ranking = rng.sample(range(10, 20), 10)
+        rules = [(x, y) for i, x in enumerate(ranking) for y in ranking[i + 1:] if rng.random() < 0.5]
+        rng.shuffle(rules)
+        update = rng.sample(range(10, 20), rng.randint(1, 9))
+        cases.append((rules, update))
+    return cases
+
+def _reference_sums(rules, updates):
+    valid_middle_sum = sum(find_middle_page(update) for update in updates if is_update_valid(update, rules))
+    reordered_middle_sum = sum(
+        find_middle_page(reorder_update(update, rules)) for update in updates if not is_update_valid(update, rules)
+    )
+    return valid_middle_sum, reordered_middle_sum
+
+# Fixtures for common input data
+@pytest.fixture
+def example_file(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(EXAMPLE_INPUT)
+    return str(input_file)
+
+@pytest.fixture
+def example_input(example_file):
+    return parse_input(example_file)
+
+# Tests for the compiled rule index
+def test_rule_index_is_valid(example_input):
+    rules, updates = example_input
+    rule_index = RuleIndex(rules)
+    assert [rule_index.is_valid(update) for update in updates] == [is_update_valid(update, rules) for update in updates], \
+        "RuleIndex validity differs from is_update_valid."
+
+def test_rule_index_partition(example_input):
+    rules, updates = example_input
+    valid, invalid = RuleIndex(rules).partition(updates)
+    assert valid == [update for update in updates if is_update_valid(update, rules)], \
+        "Valid updates or their order are incorrect."
+    assert invalid == [update for update in updates if not is_update_valid(update, rules)], \
+        "Invalid updates or their order are incorrect."
+    assert len(valid) == 3, "The example has three valid updates."
+
+def test_rule_index_remove_rule(example_input):
+    rules, updates = example_input
+    rule_index = RuleIndex(rules)
+    rule_index.remove_rule(47, 53)
+    rule_index.remove_rule(53, 47)  # Missing rules are ignored
+    remaining = [rule for rule in rules if rule != (47, 53)]
+    assert [rule_index.is_valid(update) for update in updates] == \
+        [is_update_valid(update, remaining) for update in updates], "Validity after removing a rule is incorrect."
+
+def test_rule_index_random_updates():
+    for rules, update in _random_rules_and_updates(300):
+        rng = random.Random(len(rules))
+        shuffled = rng.sample(update, len(update))
+        assert RuleIndex(rules).is_valid(shuffled) == is_update_valid(shuffled, rules), \
+            f"Validity of {shuffled} under {rules} is incorrect."
+
+# Tests for the bitset rule index and parallel validation
+def test_bitset_rule_index_is_valid(example_input):
+    rules, updates = example_input
+    rule_index = BitsetRuleIndex(rules)
+    assert [rule_index.is_valid(update) for update in updates] == [is_update_valid(update, rules) for update in updates], \
+        "Bitset validity differs from is_update_valid."
+    assert rule_index.partition(updates) == RuleIndex(rules).partition(updates), \
+        "Bitset partition differs from the RuleIndex partition."
+
+def test_bitset_rule_index_reuses_masks(example_input):
+    rules, updates = example_input
+    compiled = BitsetRuleIndex(rules)
+    rebuilt = BitsetRuleIndex(after_masks=compiled.after_masks)
+    assert [rebuilt.is_valid(update) for update in updates] == [compiled.is_valid(update) for update in updates], \
+        "An index built from compiled masks should validate the same way."
+
+def test_bitset_rule_index_random_updates():
+    for rules, update in _random_rules_and_updates(300):
+        rng = random.Random(len(rules))
+        shuffled = rng.sample(update, len(update))
+        assert BitsetRuleIndex(rules).is_valid(shuffled) == is_update_valid(shuffled, rules), \
+            f"Bitset validity of {shuffled} under {rules} is incorrect."
+
+def test_validate_updates_parallel(example_input):
+    rules, updates = example_input
+    expected = [is_update_valid(update, rules) for update in updates]
+    assert validate_updates_parallel(rules, updates, workers=2, shard_size=1) == expected, \
+        "Parallel validation with single-update shards is incorrect."
+    assert validate_updates_parallel(rules, updates, workers=2, shard_size=4) == expected, \
+        "Parallel validation should keep the input order across uneven shards."
+
+def test_validate_updates_parallel_empty(example_input):
+    rules, _ = example_input
+    assert validate_updates_parallel(rules, [], workers=2) == [], "No updates should give no results."
+
+# Tests for reordering and the middle-page fast path
+@pytest.mark.parametrize("rules, update", [
+    ([(1, 2), (2, 3)], [3, 2, 1]),                    # Total order, fast path
+    ([(1, 2)], [3, 2, 1]),                            # Page 3 is unordered
+    ([], [5, 4, 3]),                                  # No rules apply
+    ([(1, 2), (1, 3)], [2, 3, 1]),                    # Two pages share the middle rank
+    ([(1, 3), (2, 3)], [3, 1, 2, 4]),                 # Ties broken by rule order
+    ([(2, 3), (1, 3)], [3, 1, 2, 4]),                 # Same rules in the other order
+    ([(4, 1), (3, 1), (2, 1)], [1, 2, 3, 4, 5]),      # One page after all the others
+    ([(7, 8)], [9]),                                  # Single page
+])
+def test_rule_index_middle_page(rules, update):
+    rule_index = RuleIndex(rules)
+    expected = find_middle_page(reorder_update(update, rules))
+    assert rule_index.reorder(update) == reorder_update(update, rules), "Reorder differs from reorder_update."
+    assert rule_index.middle_page(update) == expected, "Middle page differs from the reordered middle page."
+
+def test_rule_index_middle_page_example(example_input):
+    rules, updates = example_input
+    rule_index = RuleIndex(rules)
+    for update in updates:
+        assert rule_index.middle_page(update) == find_middle_page(reorder_update(update, rules)), \
+            f"Middle page of {update} is incorrect."
+
+def test_rule_index_middle_page_partial_orders():
+    for rules, update in _random_rules_and_updates(500):
+        rule_index = RuleIndex(rules)
+        assert rule_index.reorder(update) == reorder_update(update, rules), \
+            f"Reorder of {update} under {rules} differs from reorder_update."
+        assert rule_index.middle_page(update) == find_middle_page(reorder_update(update, rules)), \
+            f"Middle page of {update} under {rules} is incorrect."
+
+def test_process_incorrect_updates(example_file):
+    assert process_incorrect_updates(example_file) == 123, "Sum of reordered middle pages is incorrect."
+
+# Tests for the single-pass solver
+def test_solve_print_queue(example_file):
+    assert solve_print_queue(example_file) == (143, 123), "Sums of the example are incorrect."
+
+@pytest.mark.parametrize("text", [
+    "\n\n" + EXAMPLE_INPUT,                                    # Leading blank lines
+    EXAMPLE_INPUT.replace("\n", "\r\n"),                        # CRLF line endings
+    EXAMPLE_INPUT.replace("\n\n", "\n\n\n") + "\n\n",            # Extra blank lines
+    EXAMPLE_INPUT.rstrip("\n"),                                # No final newline
+])
+def test_solve_print_queue_layout_variants(tmp_path, text):
+    input_file = tmp_path / "input.txt"
+    input_file.write_bytes(text.encode())
+    assert solve_print_queue(str(input_file)) == (143, 123), "Sums should not depend on blank lines or line endings."
+
+def test_solve_print_queue_matches_reference(example_input, example_file):
+    rules, updates = example_input
+    assert solve_print_queue(example_file) == _reference_sums(rules, updates), \
+        "Single-pass sums differ from the reference functions."
+
+# Tests for the incremental update index
+def test_update_index_example(example_input):
+    rules, updates = example_input
+    index = UpdateIndex(rules, updates)
+    assert (index.valid_middle_sum, index.reordered_middle_sum) == (143, 123), \
+        "Initial sums of the example are incorrect."
+
+def test_update_index_remove_and_readd_rules(example_input):
+    rules, updates = example_input
+    index = UpdateIndex(rules, updates)
+    active = list(rules)
+    rng = random.Random(5)
+    for rule in rng.sample(rules, len(rules)):
+        index.remove_rule(*rule)
+        active.remove(rule)
+        assert (index.valid_middle_sum, index.reordered_middle_sum) == _reference_sums(active, updates), \
+            f"Sums are incorrect after removing rule {rule}."
+    for rule in rng.sample(rules, len(rules)):
+        index.add_rule(*rule)
+        active.append(rule)
+        assert (index.valid_middle_sum, index.reordered_middle_sum) == _reference_sums(active, updates), \
+            f"Sums are incorrect after re-adding rule {rule}."
+
+def test_update_index_duplicate_and_missing_rules(example_input):
+    rules, updates = example_input
+    index = UpdateIndex(rules, updates)
+    index.add_rule(47, 53)
+    index.remove_rule(13, 97)
+    assert (index.valid_middle_sum, index.reordered_middle_sum) == (143, 123), \
+        "Re-adding an existing rule or removing a missing one should not change the sums."
+    index.remove_rule(47, 53)
+    index.add_rule(47, 53)
+    assert (index.valid_middle_sum, index.reordered_middle_sum) == (143, 123), \
+        "Removing and re-adding a rule should restore the sums."
+
+def test_update_index_reversed_rule(example_input):
+    # Reversing a rule between adjacent pages flips updates between valid and invalid without a cycle
+    rules, updates = example_input
+    index = UpdateIndex(rules, updates)
+    active = list(rules)
+    for x, y in [(75, 47), (53, 29), (29, 13)]:
+        index.remove_rule(x, y)
+        index.add_rule(y, x)
+        active.remove((x, y))
+        active.append((y, x))
+        assert (index.valid_middle_sum, index.reordered_middle_sum) == _reference_sums(active, updates), \
+            f"Sums are incorrect after reversing rule {x}|{y}."
+
+def test_update_index_random_rule_changes():
+    rng = random.Random(20)
+    ranking = rng.sample(range(10, 30), 20)
+    all_rules = [(x, y) for i, x in enumerate(ranking) for y in ranking[i + 1:]]
+    updates = [rng.sample(range(10, 30), rng.choice([3, 5, 7])) for _ in range(40)]
+    active = rng.sample(all_rules, len(all_rules) // 2)
+    index = UpdateIndex(active, updates)
+    for _ in range(200):
+        rule = rng.choice(all_rules)
+        if rule in active:
+            index.remove_rule(*rule)
+            active.remove(rule)
+        else:
+            index.add_rule(*rule)
+            active.append(rule)
+        assert (index.valid_middle_sum, index.reordered_middle_sum) == _reference_sums(active, updates), \
+            f"Sums are incorrect after toggling rule {rule}."
@@ -1,6 +1,8 @@
 # guard_gallivant.py
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 def parse_map(input_file):
     """
@@ -189,22 +191,308 @@ def find_loop_positions(grid, initial_position, initial_direction):
     return loop_count
 
 
+# Direction deltas: Up, Right, Down, Left
+DELTA_ROWS = (-1, 0, 1, 0)
+DELTA_COLS = (0, 1, 0, -1)
+
+class JumpTable:
+    """
+    Precomputed straight-line moves for the guard.
+
+    stops[d][r * cols + c] is the flat index of the cell where a guard walking in
+    direction d from (r, c) stops in front of an obstacle, or -1 if it walks off the
+    map. A simulation then advances one whole segment per step instead of one cell.
+    """
+
+    def __init__(self, grid):
+        """
+        Builds the tables in one pass per direction.
+
+        Args:
+            grid (List[List[bool]]): The grid representing the map.
+        """
+        self.rows = rows = len(grid)
+        self.cols = cols = len(grid[0]) if rows > 0 else 0
+        up, right, down, left = ([-1] * (rows * cols) for _ in range(4))
+        for r in range(rows):
+            for c in range(cols):
+                i = r * cols + c
+                if r > 0:
+                    up[i] = i if grid[r - 1][c] else up[i - cols]
+                if c > 0:
+                    left[i] = i if grid[r][c - 1] else left[i - 1]
+        for r in range(rows - 1, -1, -1):
+            for c in range(cols - 1, -1, -1):
+                i = r * cols + c
+                if r < rows - 1:
+                    down[i] = i if grid[r + 1][c] else down[i + cols]
+                if c < cols - 1:
+                    right[i] = i if grid[r][c + 1] else right[i + 1]
+        self.stops = (up, right, down, left)
+
+    def next_stop(self, position, direction, obstacle=None):
+        """
+        Returns where the guard stops, optionally with one extra obstacle overlaid.
+
+        Args:
+            position (int): Flat index of the guard's cell.
+            direction (int): The guard's direction (0=Up, 1=Right, 2=Down, 3=Left).
+            obstacle (int, optional): Flat index of a temporarily added obstacle.
+
+        Returns:
+            int: Flat index of the stopping cell, or -1 if the guard leaves the map.
+        """
+        stop = self.stops[direction][position]
+        if obstacle is None:
+            return stop
+        cols = self.cols
+        row, col = divmod(position, cols)
+        obs_row, obs_col = divmod(obstacle, cols)
+        if direction % 2 == 0:
+            if obs_col != col:
+                return stop
+            distance = (obs_row - row) * DELTA_ROWS[direction]
+            stop_distance = abs(stop // cols - row) if stop != -1 else self.rows
+        else:
+            if obs_row != row:
+                return stop
+            distance = (obs_col - col) * DELTA_COLS[direction]
+            stop_distance = abs(stop - position) if stop != -1 else cols
+        if 1 <= distance <= stop_distance:
+            step = DELTA_ROWS[direction] * cols + DELTA_COLS[direction]
+            return position + (distance - 1) * step
+        return stop
+
+    def exit_cell(self, position, direction):
+        """
+        Returns the flat index of the last cell on the map in the given direction.
+        """
+        row, col = divmod(position, self.cols)
+        if direction == 0:
+            return col
+        if direction == 1:
+            return row * self.cols + self.cols - 1
+        if direction == 2:
+            return (self.rows - 1) * self.cols + col
+        return row * self.cols
+
+def simulate_guard_jump(grid, initial_position, initial_direction, table=None):
+    """
+    Counts the distinct positions visited by the guard, one straight segment per step.
+
+    Args:
+        grid (List[List[bool]]): The grid representing the map.
+        initial_position (Tuple[int, int]): The initial position of the guard (row, col).
+        initial_direction (int): The initial direction of the guard (0=Up, 1=Right, 2=Down, 3=Left).
+        table (JumpTable, optional): Precomputed jump table for the grid.
+
+    Returns:
+        int: The number of distinct positions visited by the guard.
+    """
+    table = table or JumpTable(grid)
+    cols = table.cols
+    visited = bytearray(table.rows * cols)
+    position = initial_position[0] * cols + initial_position[1]
+    direction = initial_direction
+    seen_states = set()
+
+    while (position, direction) not in seen_states:
+        seen_states.add((position, direction))
+        stop = table.stops[direction][position]
+        end = stop if stop != -1 else table.exit_cell(position, direction)
+        # Mark the whole segment with one strided slice assignment
+        stride = cols if direction % 2 == 0 else 1
+        low, high = min(position, end), max(position, end)
+        visited[low:high + 1:stride] = b"\x01" * ((high - low) // stride + 1)
+        if stop == -1:
+            break
+        position, direction = stop, (direction + 1) % 4
+
+    return visited.count(1)
+
+def record_patrol_path(grid, initial_position, initial_direction):
+    """
+    Walks the original patrol and records every cell in first-visit order.
+
+    Args:
+        grid (List[List[bool]]): The grid representing the map.
+        initial_position (Tuple[int, int]): The initial position of the guard (row, col).
+        initial_direction (int): The initial direction of the guard (0=Up, 1=Right, 2=Down, 3=Left).
+
+    Returns:
+        List[Tuple[Tuple[int, int], Tuple[int, int], int]]: For each cell after the start,
+        the cell together with the guard's position and direction just before it first
+        stepped onto that cell.
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows > 0 else 0
+    current_row, current_col = initial_position
+    current_dir = initial_direction
+    visited = {initial_position}
+    seen_states = set()
+    path = []
+
+    while (current_row, current_col, current_dir) not in seen_states:
+        seen_states.add((current_row, current_col, current_dir))
+        next_row = current_row + DELTA_ROWS[current_dir]
+        next_col = current_col + DELTA_COLS[current_dir]
+        if not (0 <= next_row < rows and 0 <= next_col < cols):
+            break
+        if grid[next_row][next_col]:
+            current_dir = (current_dir + 1) % 4
+            continue
+        if (next_row, next_col) not in visited:
+            visited.add((next_row, next_col))
+            path.append(((next_row, next_col), (current_row, current_col), current_dir))
+        current_row, current_col = next_row, next_col
+
+    return path
+
+def simulate_guard_with_obstacle_jump(table, initial_position, initial_direction, obstacle_pos):
+    """
+    Checks whether one extra obstacle traps the guard in a loop, segment by segment.
+
+    The obstacle is only overlaid on the jump table, so the grid is never modified.
+
+    Args:
+        table (JumpTable): Precomputed jump table for the grid.
+        initial_position (Tuple[int, int]): The initial position of the guard (row, col).
+        initial_direction (int): The initial direction of the guard (0=Up, 1=Right, 2=Down, 3=Left).
+        obstacle_pos (Tuple[int, int]): Position of the extra obstacle (row, col).
+
+    Returns:
+        bool: True if the guard gets stuck in a loop, False otherwise.
+    """
+    cols = table.cols
+    obstacle = obstacle_pos[0] * cols + obstacle_pos[1]
+    position = initial_position[0] * cols + initial_position[1]
+    direction = initial_direction
+    turns = set()
+
+    while True:
+        position = table.next_stop(position, direction, obstacle)
+        if position == -1:
+            return False
+        state = (position, direction)
+        if state in turns:
+            return True
+        turns.add(state)
+        direction = (direction + 1) % 4
+
+def find_loop_positions_jump(grid, initial_position, initial_direction):
+    """
+    Counts the positions where one extra obstacle traps the guard, using jump tables.
+
+    Args:
+        grid (List[List[bool]]): The grid representing the map.
+        initial_position (Tuple[int, int]): The initial position of the guard (row, col).
+        initial_direction (int): The initial direction of the guard (0=Up, 1=Right, 2=Down, 3=Left).
+
+    Returns:
+        int: The number of positions that would create a loop.
+    """
+    table = JumpTable(grid)
+    loop_count = 0
+    for r in range(table.rows):
+        for c in range(table.cols):
+            if (r, c) != initial_position and not grid[r][c]:
+                if simulate_guard_with_obstacle_jump(table, initial_position, initial_direction, (r, c)):
+                    loop_count += 1
+    return loop_count
+
+def find_loop_positions_warm(grid, initial_position, initial_direction):
+    """
+    Counts loop-creating obstacle positions, trying only cells on the original patrol.
+
+    An obstacle off the patrol path never changes the guard's route. For a cell on the
+    path, the guard's route is unchanged until it first tries to enter that cell, so
+    each simulation starts from the guard's state just before that moment.
+
+    Args:
+        grid (List[List[bool]]): The grid representing the map.
+        initial_position (Tuple[int, int]): The initial position of the guard (row, col).
+        initial_direction (int): The initial direction of the guard (0=Up, 1=Right, 2=Down, 3=Left).
+
+    Returns:
+        int: The number of positions that would create a loop.
+    """
+    table = JumpTable(grid)
+    loop_count = 0
+    for cell, position, direction in record_patrol_path(grid, initial_position, initial_direction):
+        if simulate_guard_with_obstacle_jump(table, position, direction, cell):
+            loop_count += 1
+    return loop_count
+
+_worker_table = None
+
+def _init_loop_worker(flat_map, rows, cols):
+    global _worker_table
+    grid = [[bool(cell) for cell in flat_map[r * cols:(r + 1) * cols]] for r in range(rows)]
+    _worker_table = JumpTable(grid)
+
+def _count_loops_in_shard(candidates):
+    return sum(
+        simulate_guard_with_obstacle_jump(_worker_table, position, direction, cell)
+        for cell, position, direction in candidates
+    )
+
+def find_loop_positions_parallel(grid, initial_position, initial_direction, workers=None, shard_size=None):
+    """
+    Counts loop-creating obstacle positions on a process pool without mutating the grid.
+
+    The map is shipped to each worker once as flat bytes through the pool
+    initializer, and each worker builds its own read-only jump table. Candidate cells
+    from the original patrol, each with its warm-start state, are then split into
+    shards and checked with the obstacle passed as an overlay.
+
+    Args:
+        grid (List[List[bool]]): The grid representing the map.
+        initial_position (Tuple[int, int]): The initial position of the guard (row, col).
+        initial_direction (int): The initial direction of the guard (0=Up, 1=Right, 2=Down, 3=Left).
+        workers (int, optional): Number of worker processes (defaults to the CPU count).
+        shard_size (int, optional): Candidates per task (defaults to four tasks per worker).
+
+    Returns:
+        int: The number of positions that would create a loop.
+    """
+    candidates = record_patrol_path(grid, initial_position, initial_direction)
+    if not candidates:
+        return 0
+    rows = len(grid)
+    cols = len(grid[0]) if rows > 0 else 0
+    flat_map = bytes(cell for row in grid for cell in row)
+    workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, -(-len(candidates) // (workers * 4)))
+    shards = [candidates[i:i + shard_size] for i in range(0, len(candidates), shard_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=_init_loop_worker,
+                             initargs=(flat_map, rows, cols)) as executor:
+        return sum(executor.map(_count_loops_in_shard, shards))
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python guard_gallivant.py <input_file>")
+    if len(sys.argv) not in (2, 3) or (len(sys.argv) == 3 and sys.argv[2] not in ("--jump", "--warm", "--parallel")):
+        print("Usage: python guard_gallivant.py <input_file> [--jump|--warm|--parallel]")
         sys.exit(1)
 
     input_file = sys.argv[1]
+    mode = sys.argv[2] if len(sys.argv) == 3 else None
 
     try:
         grid, initial_position, initial_direction = parse_map(input_file)
+        if mode == "--jump":
+            simulate, find_loops = simulate_guard_jump, find_loop_positions_jump
+        elif mode == "--warm":
+            simulate, find_loops = simulate_guard_jump, find_loop_positions_warm
+        elif mode == "--parallel":
+            simulate, find_loops = simulate_guard_jump, find_loop_positions_parallel
+        else:
+            simulate, find_loops = simulate_guard, find_loop_positions
 
         # Part One result
-        result_part_one = simulate_guard(grid, initial_position, initial_direction)
+        result_part_one = simulate(grid, initial_position, initial_direction)
         print(f"Number of distinct positions visited (Part One): {result_part_one}")
 
         # Part Two result
-        loop_positions_count = find_loop_positions(grid, initial_position, initial_direction)
+        loop_positions_count = find_loops(grid, initial_position, initial_direction)
         print(f"Number of positions that would create a loop (Part Two): {loop_positions_count}")
 
     except FileNotFoundError:
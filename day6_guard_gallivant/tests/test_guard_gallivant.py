@@ -0,0 +1,184 @@
+# day6_guard_gallivant/tests/test_guard_gallivant.py
+
+import copy
+import os
+import random
+import pytest
+from day6_guard_gallivant.guard_gallivant import (
+    parse_map,
+    simulate_guard,
+    find_loop_positions,
+    JumpTable,
+    simulate_guard_jump,
+    record_patrol_path,
+    find_loop_positions_warm,
+    find_loop_positions_parallel
+)
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "sample.txt")
+
+def _loops_with_obstacle(grid, initial_position, initial_direction, obstacle_pos=None):
+    # Cell-by-cell reference walk; the obstacle is only overlaid, and every turn is a state
+    rows, cols = len(grid), len(grid[0])
+    row, col = initial_position
+    direction = initial_direction
+    seen_states = set()
+    while (row, col, direction) not in seen_states:
+        seen_states.add((row, col, direction))
+        next_row = row + (-1, 0, 1, 0)[direction]
+        next_col = col + (0, 1, 0, -1)[direction]
+        if not (0 <= next_row < rows and 0 <= next_col < cols):
+            return False
+        if grid[next_row][next_col] or (next_row, next_col) == obstacle_pos:
+            direction = (direction + 1) % 4
+        else:
+            row, col = next_row, next_col
+    return True
+
+def _brute_force_loop_count(grid, initial_position, initial_direction):
+    return sum(
+        _loops_with_obstacle(grid, initial_position, initial_direction, (r, c))
+        for r in range(len(grid))
+        for c in range(len(grid[0]))
+        if (r, c) != initial_position and not grid[r][c]
+    )
+
+def _random_maps(count, seed=2024):
+    # Small random maps whose original patrol leaves the map, as the puzzle guarantees
+    rng = random.Random(seed)
+    maps = []
+    while len(maps) < count:
+        rows, cols = rng.randint(1, 9), rng.randint(1, 9)
+        grid = [[rng.random() < 0.2 for _ in range(cols)] for _ in range(rows)]
+        initial_position = (rng.randrange(rows), rng.randrange(cols))
+        grid[initial_position[0]][initial_position[1]] = False
+        initial_direction = rng.randrange(4)
+        if not _loops_with_obstacle(grid, initial_position, initial_direction):
+            maps.append((grid, initial_position, initial_direction))
+    return maps
+
+def _grid(lines):
+    return [[char == '#' for char in line] for line in lines]
+
+def _walk_to_stop(grid, position, direction, obstacle_pos=None):
+    # Cell-by-cell reference for JumpTable.next_stop
+    rows, cols = len(grid), len(grid[0])
+    row, col = position
+    while True:
+        next_row = row + (-1, 0, 1, 0)[direction]
+        next_col = col + (0, 1, 0, -1)[direction]
+        if not (0 <= next_row < rows and 0 <= next_col < cols):
+            return None
+        if grid[next_row][next_col] or (next_row, next_col) == obstacle_pos:
+            return row, col
+        row, col = next_row, next_col
+
+# Fixtures for common input data
+@pytest.fixture
+def sample_map():
+    return parse_map(SAMPLE_FILE)
+
+# Tests for the jump table
+JUMP_GRID = _grid([
+    "..#....",
+    ".......",
+    ".......",
+    "....#..",
+    "..^....",
+])
+
+@pytest.mark.parametrize("position, direction, obstacle, expected", [
+    ((4, 2), 0, None, (1, 2)),      # Natural stop below the real obstacle
+    ((4, 2), 0, (2, 2), (3, 2)),    # Obstacle before the natural stop
+    ((4, 2), 0, (1, 2), (2, 2)),    # Obstacle on the natural stop, next to the real obstacle
+    ((4, 2), 0, (3, 2), (4, 2)),    # Obstacle right in front of the guard
+    ((3, 0), 1, (3, 5), (3, 3)),    # Obstacle behind the real obstacle is ignored
+    ((3, 0), 1, (4, 1), (3, 3)),    # Obstacle on another row is ignored
+    ((4, 2), 0, (2, 3), (1, 2)),    # Obstacle on another column is ignored
+    ((4, 2), 0, (4, 0), (1, 2)),    # Obstacle on the guard's row does not block a vertical move
+    ((2, 5), 3, (2, 6), None),     # Obstacle behind the guard is ignored
+    ((4, 6), 0, None, None),        # Walks off the map
+    ((4, 6), 0, (0, 6), (1, 6)),    # Obstacle on the last cell before the edge
+    ((4, 6), 0, (2, 6), (3, 6)),    # Obstacle in the middle of an open column
+    ((0, 1), 2, (4, 1), (3, 1)),    # Downward move onto an obstacle on the last row
+    ((2, 6), 3, (2, 0), (2, 1)),    # Leftward move onto an obstacle on the first column
+])
+def test_jump_table_next_stop(position, direction, obstacle, expected):
+    table = JumpTable(JUMP_GRID)
+    cols = table.cols
+    flat_obstacle = obstacle[0] * cols + obstacle[1] if obstacle is not None else None
+    stop = table.next_stop(position[0] * cols + position[1], direction, flat_obstacle)
+    assert stop == (expected[0] * cols + expected[1] if expected is not None else -1), \
+        f"next_stop from {position} facing {direction} with obstacle {obstacle} is incorrect."
+
+def test_jump_table_next_stop_matches_walk():
+    for grid, _, _ in _random_maps(200):
+        table = JumpTable(grid)
+        cols = table.cols
+        cells = [(r, c) for r in range(table.rows) for c in range(cols)]
+        for position in cells:
+            for direction in range(4):
+                for obstacle in [None] + cells:
+                    if obstacle == position:
+                        continue
+                    expected = _walk_to_stop(grid, position, direction, obstacle)
+                    flat_obstacle = obstacle[0] * cols + obstacle[1] if obstacle is not None else None
+                    stop = table.next_stop(position[0] * cols + position[1], direction, flat_obstacle)
+                    assert stop == (expected[0] * cols + expected[1] if expected is not None else -1), \
+                        f"next_stop from {position} facing {direction} with obstacle {obstacle} is incorrect."
+
+def test_simulate_guard_jump_sample(sample_map):
+    assert simulate_guard(*sample_map) == 41, "Reference visited count of the sample is incorrect."
+    assert simulate_guard_jump(*sample_map) == 41, "Jump visited count of the sample is incorrect."
+
+def test_simulate_guard_jump_matches_reference():
+    for grid, initial_position, initial_direction in _random_maps(500):
+        assert simulate_guard_jump(grid, initial_position, initial_direction) == \
+            simulate_guard(grid, initial_position, initial_direction), \
+            f"Jump visited count differs from the reference on {grid} from {initial_position}."
+
+# Tests for the warm-started loop search
+def test_find_loop_positions_warm_sample(sample_map):
+    assert find_loop_positions_warm(*sample_map) == 6, "Warm-started loop count of the sample is incorrect."
+
+def test_find_loop_positions_warm_matches_brute_force():
+    for grid, initial_position, initial_direction in _random_maps(4000):
+        expected = _brute_force_loop_count(grid, initial_position, initial_direction)
+        assert find_loop_positions_warm(grid, initial_position, initial_direction) == expected, \
+            f"Warm-started loop count differs from brute force on {grid} from {initial_position}."
+
+def test_record_patrol_path_turns_in_place():
+    # Blocked above and to the right, the guard turns twice before first stepping down
+    grid = _grid([".#..", "..#.", "...."])
+    path = record_patrol_path(grid, (1, 1), 0)
+    assert path[0] == ((2, 1), (1, 1), 2), "The recorded state should be the one after both turns."
+    assert find_loop_positions_warm(grid, (1, 1), 0) == _brute_force_loop_count(grid, (1, 1), 0), \
+        "Warm-started loop count differs from brute force after turns in place."
+
+def test_find_loop_positions_warm_boxed_in_candidate():
+    # Blocking the only way out boxes the guard in, which counts as a loop
+    grid = _grid([".#.", "#.#", "..."])
+    assert find_loop_positions_warm(grid, (1, 1), 0) == 1, "Boxing the guard in should count as a loop."
+
+# Tests for the process-parallel loop search
+@pytest.mark.parametrize("workers", [1, 2])
+def test_find_loop_positions_parallel(sample_map, workers):
+    grid, initial_position, initial_direction = sample_map
+    original = copy.deepcopy(grid)
+    assert find_loop_positions(grid, initial_position, initial_direction) == 6, \
+        "Reference loop count of the sample is incorrect."
+    result = find_loop_positions_parallel(grid, initial_position, initial_direction, workers=workers)
+    assert result == 6, f"Parallel loop count with workers={workers} is incorrect."
+    assert grid == original, "The parallel search should not modify the grid."
+
+def test_find_loop_positions_parallel_single_task_shards(sample_map):
+    grid, initial_position, initial_direction = sample_map
+    result = find_loop_positions_parallel(grid, initial_position, initial_direction, workers=2, shard_size=1)
+    assert result == 6, "Loop count should not depend on the shard size."
+
+def test_find_loop_positions_parallel_non_square_map():
+    # Rebuilding the grid from flat bytes must keep rows and columns apart
+    grid = _grid(["..#...", "...##.", "#..#..", "..###."])
+    assert find_loop_positions(grid, (2, 2), 0) == 3, "Reference loop count of the map is incorrect."
+    assert find_loop_positions_parallel(grid, (2, 2), 0, workers=2) == 3, \
+        "Parallel loop count on a non-square map differs from the reference."